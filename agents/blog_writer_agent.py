@@ -3,43 +3,148 @@ Blog Writer Agent for Content Marketing Pipeline
 Creates high-quality blog articles using OpenAI GPT-4o
 """
 
-import os
-import json
-from crewai import Agent
-from langchain_openai import ChatOpenAI
+import asyncio
+import functools
+import dataclasses
+from utils.chat_models import get_llm
+from agents.schemas import BlogArticle, BlogArticleBatch, ArticlePlan, SeoOptimization
+from agents.results import BlogArticleResult
+from utils.openai_client import (
+    complete_structured, acomplete_structured, acomplete_text, parse_structured, response_format_for, build_messages,
+    run_sync
+)
+from utils.openai_batch import run_chat_batch
+from utils.jsonutil import dumps
+
+
+_BLOG_BACKSTORY = """You are a seasoned content writer with expertise in creating engaging, 
+            SEO-optimized blog content across various industries. You have a talent for transforming 
+            complex topics into accessible, engaging narratives that resonate with target audiences. 
+            Your writing style adapts to different brand voices while maintaining clarity, authority, 
+            and reader engagement. You understand the importance of structure, flow, and call-to-actions 
+            in driving reader engagement and conversions."""
+
+_ARTICLE_SYSTEM_PROMPT = f"""{_BLOG_BACKSTORY}
+
+Write compelling blog articles to the specifications provided by the user.
+
+Structure the article with:
+1. Engaging headline
+2. Hook opening paragraph
+3. 3-4 main sections with subheadings
+4. Practical insights and actionable tips
+5. Strong conclusion with call-to-action
+
+Make the content:
+- Informative and valuable
+- Engaging and well-structured
+- SEO-friendly with natural keyword integration
+- Actionable with clear takeaways
+"""
+
+_ARTICLES_SYSTEM_PROMPT = f"""{_ARTICLE_SYSTEM_PROMPT}
+The user sends a JSON array of article specifications. Write one complete article per
+specification and return them in the same order.
+"""
+
+_PLAN_SYSTEM_PROMPT = f"""{_BLOG_BACKSTORY}
+
+Plan compelling blog articles to the specifications provided by the user.
+
+Outline the article with:
+1. Engaging headline
+2. Hook opening paragraph (written in full)
+3. 3-4 main sections with subheadings, each with key points and a word budget
+4. A final conclusion section that leads into the call-to-action
+
+The section word budgets should add up to the target word count.
+"""
+
+_SECTION_SYSTEM_PROMPT = f"""{_BLOG_BACKSTORY}
+
+Write a single section of a blog article from its outline.
+
+Make the content:
+- Informative and valuable
+- Practical, with actionable tips
+- SEO-friendly with natural keyword integration
+
+Return only the section body in markdown, without the section heading.
+"""
+
+_SEO_SYSTEM_PROMPT = """You are an SEO specialist optimizing blog articles for search.
+
+Provide SEO optimizations:
+1. Improved headline with primary keyword
+2. Optimized meta description (150-160 characters)
+3. Suggested internal linking opportunities
+4. Keyword density recommendations
+5. Featured snippet optimization suggestions
+"""
+
+# Per-call user prompts, filled with str.format; run settings precede the topic so repeated runs share a prefix
+_ARTICLE_PROMPT_TEMPLATE = """Target word count: {word_count} words
+Target audience: {target_audience}
+Brand voice: {brand_voice}
+Topic: {topic_title}
+Content angles to include: {angles}
+"""
+
+_SECTION_PROMPT_TEMPLATE = """Brand voice: {brand_voice}
+Target word count: {word_count} words
+Article headline: {headline}
+Section heading: {heading}
+Key points to cover:
+{key_points}
+"""
+
+_SEO_PROMPT_TEMPLATE = """Current headline: {headline}
+Current meta description: {meta_description}
+Primary keyword: {primary_keyword}
+Secondary keywords: {secondary_keywords}
+"""
 
 
 class BlogWriterAgent:
     """Agent responsible for writing engaging blog articles"""
     
-    def __init__(self):
+    def __init__(self, model="gpt-4o", cache=None):
         # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
         # do not change this unless explicitly requested by the user
-        self.llm = ChatOpenAI(
-            model="gpt-4o",
-            api_key=os.getenv("OPENAI_API_KEY"),
-            temperature=0.8
-        )
+        self.model = model
+        self.temperature = 0.8
+        self.section_model = "gpt-4o-mini"  # Drafts individual sections in sectioned mode
+        # SEO suggestions are short JSON rewrites; a smaller model at low temperature is enough
+        self.seo_model = "gpt-4o-mini"
+        self.seo_temperature = 0.2
+        # Cache LLM responses on disk (None: only deterministic calls, when CACHE_ENABLED is set)
+        self.cache = cache
+        self._agent = None
+    
+    @functools.cached_property
+    def llm(self):
+        """LangChain chat model for the CrewAI agent, created on first use"""
+        return get_llm(self.model, self.temperature)
     
     def create_agent(self):
-        """Create and return the blog writer agent"""
-        return Agent(
-            role="Expert Content Writer",
-            goal="Create compelling, well-researched blog articles that engage readers, provide value, and drive business objectives",
-            backstory="""You are a seasoned content writer with expertise in creating engaging, 
-            SEO-optimized blog content across various industries. You have a talent for transforming 
-            complex topics into accessible, engaging narratives that resonate with target audiences. 
-            Your writing style adapts to different brand voices while maintaining clarity, authority, 
-            and reader engagement. You understand the importance of structure, flow, and call-to-actions 
-            in driving reader engagement and conversions.""",
-            verbose=True,
-            allow_delegation=False,
-            llm=self.llm,
-            max_iter=3,
-            memory=True
-        )
+        """Create and return the blog writer agent (built once per instance)"""
+        from crewai import Agent
+        
+        if self._agent is None:
+            self._agent = Agent(
+                role="Expert Content Writer",
+                goal="Create compelling, well-researched blog articles that engage readers, provide value, and drive business objectives",
+                backstory=_BLOG_BACKSTORY,
+                verbose=True,
+                allow_delegation=False,
+                llm=self.llm,
+                max_iter=3,
+                memory=True
+            )
+        return self._agent
     
-    def write_blog_article(self, topic_data, target_word_count=500, brand_voice="professional"):
+    def write_blog_article(self, topic_data, target_word_count=500, brand_voice="professional", sectioned=False,
+                           on_chunk=None):
         """
         Write a complete blog article based on topic research
         
@@ -47,178 +152,321 @@ class BlogWriterAgent:
             topic_data (dict): Topic information from research agent
             target_word_count (int): Target word count (300-600)
             brand_voice (str): Brand voice style
+            sectioned (bool): Plan the article, then draft its sections in parallel
+            on_chunk (callable): Stream the response, passing each content delta to this callback
+                (not supported with sectioned, whose sections are drafted concurrently)
             
         Returns:
-            dict: Complete blog article with metadata
+            BlogArticleResult: Complete blog article with metadata
+            
+        Raises:
+            ValueError: If on_chunk is combined with sectioned
         """
+        if sectioned:
+            if on_chunk:
+                raise ValueError("on_chunk streaming is not supported for sectioned articles")
+            return run_sync(self.awrite_blog_article(topic_data, target_word_count, brand_voice, sectioned=True))
+        
         try:
-            # Ensure word count is within specified range
-            word_count = max(300, min(600, target_word_count))
-            
-            topic_title = topic_data.get('title', 'Trending Industry Topic')
-            content_angles = topic_data.get('content_angles', [])
-            target_audience = topic_data.get('target_audience', 'business professionals')
-            
-            angles_str = ", ".join(content_angles) if content_angles else "industry insights, practical tips"
-            
-            prompt = f"""
-            Write a compelling blog article with the following specifications:
-            
-            Topic: {topic_title}
-            Target word count: {word_count} words
-            Target audience: {target_audience}
-            Brand voice: {brand_voice}
-            Content angles to include: {angles_str}
-            
-            Structure the article with:
-            1. Engaging headline
-            2. Hook opening paragraph
-            3. 3-4 main sections with subheadings
-            4. Practical insights and actionable tips
-            5. Strong conclusion with call-to-action
-            
-            Make the content:
-            - Informative and valuable
-            - Engaging and well-structured
-            - SEO-friendly with natural keyword integration
-            - Actionable with clear takeaways
+            prompt, context = self._build_article_prompt(topic_data, target_word_count, brand_voice)
+            result = complete_structured(prompt, BlogArticle, model=self.model, temperature=self.temperature,
+                                         system=_ARTICLE_SYSTEM_PROMPT, on_chunk=on_chunk, cache=self.cache)
+            return self._finalize_article(result, **context)
+        except Exception as e:
+            return self._article_error(e)
+    
+    async def awrite_blog_article(self, topic_data, target_word_count=500, brand_voice="professional", sectioned=False,
+                                  on_chunk=None):
+        """Async variant of write_blog_article, suitable for asyncio.gather fan-out"""
+        try:
+            prompt, context = self._build_article_prompt(topic_data, target_word_count, brand_voice)
+            if sectioned:
+                plan = await self._plan(prompt)
+                sections = await asyncio.gather(*[
+                    self._draft_section(spec, plan['headline'], brand_voice)
+                    for spec in plan['sections']
+                ])
+                result = self._stitch(sections, plan)
+            else:
+                result = await acomplete_structured(prompt, BlogArticle, model=self.model, temperature=self.temperature,
+                                                    system=_ARTICLE_SYSTEM_PROMPT, on_chunk=on_chunk, cache=self.cache)
+            return self._finalize_article(result, **context)
+        except Exception as e:
+            return self._article_error(e)
+    
+    async def _plan(self, prompt):
+        """Outline the article: headline, hook, section specs and metadata"""
+        return await acomplete_structured(prompt, ArticlePlan, model=self.model, temperature=self.temperature,
+                                          system=_PLAN_SYSTEM_PROMPT, cache=self.cache)
+    
+    async def _draft_section(self, spec, headline, brand_voice):
+        """Draft the body of one planned section with the smaller section model"""
+        key_points = "\n".join(f"- {point}" for point in spec['key_points'])
+        prompt = _SECTION_PROMPT_TEMPLATE.format(
+            headline=headline,
+            heading=spec['heading'],
+            word_count=spec['word_count'],
+            brand_voice=brand_voice,
+            key_points=key_points
+        )
+        return await acomplete_text(prompt, model=self.section_model, temperature=self.temperature,
+                                    system=_SECTION_SYSTEM_PROMPT, cache=self.cache)
+    
+    def _stitch(self, sections, plan):
+        """Assemble the planned metadata and drafted sections into a BlogArticle dict"""
+        parts = [plan['hook'].strip()]
+        for spec, body in zip(plan['sections'], sections):
+            parts.append(f"## {spec['heading']}\n\n{(body or '').strip()}")
+        article_content = "\n\n".join(parts)
+        
+        return {
+            "headline": plan['headline'],
+            "meta_description": plan['meta_description'],
+            "article_content": article_content,
+            "word_count": len(article_content.split()),
+            "key_takeaways": plan['key_takeaways'],
+            "suggested_tags": plan['suggested_tags'],
+            "reading_time": "",
+            "call_to_action": plan['call_to_action']
+        }
+    
+    async def awrite_blog_articles(self, topic_data_list, target_word_count=500, brand_voice="professional",
+                                   articles_per_request=1):
+        """
+        Write one blog article per topic concurrently
+        
+        Args:
+            topic_data_list (list): Topic dicts from the research agent
+            target_word_count (int): Target word count (300-600), unless a topic sets its own
+            brand_voice (str): Brand voice style
+            articles_per_request (int): Topics written together in one request, grouped by word count
             
-            Return the response in JSON format:
-            {{
-                "headline": "Compelling Blog Headline",
-                "meta_description": "SEO meta description (150-160 chars)",
-                "article_content": "Full article content in markdown format",
-                "word_count": {word_count},
-                "key_takeaways": ["takeaway1", "takeaway2", "takeaway3"],
-                "suggested_tags": ["tag1", "tag2", "tag3"],
-                "reading_time": "5 min read",
-                "call_to_action": "Specific CTA text"
-            }}
-            """
+        Returns:
+            list: BlogArticleResult objects in the same order as topic_data_list
+        """
+        if articles_per_request <= 1:
+            tasks = [
+                self.awrite_blog_article(topic_data, target_word_count, brand_voice)
+                for topic_data in topic_data_list
+            ]
+            return list(await asyncio.gather(*tasks))
+        
+        # Bin topics with similar target lengths together so one long article doesn't hold up a group
+        order = sorted(
+            range(len(topic_data_list)),
+            key=lambda index: topic_data_list[index].get('target_word_count', target_word_count)
+        )
+        groups = [order[start:start + articles_per_request] for start in range(0, len(order), articles_per_request)]
+        group_results = await asyncio.gather(*[
+            self._awrite_article_group([topic_data_list[index] for index in group], target_word_count, brand_voice)
+            for group in groups
+        ])
+        
+        articles = [None] * len(topic_data_list)
+        for group, results in zip(groups, group_results):
+            for index, article in zip(group, results):
+                articles[index] = article
+        return articles
+    
+    async def _awrite_article_group(self, topic_data_list, target_word_count, brand_voice):
+        """Write several articles with a single request carrying a JSON array of specifications"""
+        try:
+            specs = [self._article_spec(topic_data, target_word_count, brand_voice) for topic_data in topic_data_list]
+            result = await acomplete_structured(dumps(specs), BlogArticleBatch, model=self.model,
+                                                temperature=self.temperature, system=_ARTICLES_SYSTEM_PROMPT,
+                                                cache=self.cache)
+        except Exception as e:
+            return [self._article_error(e) for _ in topic_data_list]
+        
+        articles = result['articles']
+        return [
+            self._finalize_article(articles[index], spec['topic_title'], spec['word_count'])
+            if index < len(articles) else self._article_error("Article missing from combined response")
+            for index, spec in enumerate(specs)
+        ]
+    
+    def write_blog_articles(self, topic_data_list, target_word_count=500, brand_voice="professional",
+                            use_batch_api=False, articles_per_request=1):
+        """
+        Write one blog article per topic
+        
+        Args:
+            topic_data_list (list): Topic dicts from the research agent
+            target_word_count (int): Target word count (300-600), unless a topic sets its own
+            brand_voice (str): Brand voice style
+            use_batch_api (bool): Submit through the OpenAI Batch API (cheaper, up to 24h turnaround)
+            articles_per_request (int): Topics written together in one request, grouped by word count
             
-            response = self.llm.invoke(prompt)
+        Returns:
+            list: BlogArticleResult objects in the same order as topic_data_list
+        """
+        if use_batch_api:
+            return self.submit_batch(topic_data_list, target_word_count, brand_voice)
+        return run_sync(self.awrite_blog_articles(topic_data_list, target_word_count, brand_voice,
+                                                  articles_per_request))
+    
+    def submit_batch(self, topic_data_list, target_word_count=500, brand_voice="professional", poll_interval=30):
+        """
+        Write blog articles through the OpenAI Batch API and wait for the results
+        
+        Args:
+            topic_data_list (list): Topic dicts from the research agent
+            target_word_count (int): Target word count (300-600)
+            brand_voice (str): Brand voice style
+            poll_interval (int): Seconds between batch status checks
             
-            try:
-                content = response.content
-                # Try to extract JSON from the response if it's wrapped in text
-                if "```json" in content:
-                    start = content.find("```json") + 7
-                    end = content.find("```", start)
-                    content = content[start:end].strip()
-                elif "```" in content:
-                    start = content.find("```") + 3
-                    end = content.find("```", start)
-                    content = content[start:end].strip()
-                
-                result = json.loads(content)
-                
-                # Validate and enhance the response
-                if not result.get('headline'):
-                    result['headline'] = topic_title
-                if not result.get('article_content'):
-                    result['article_content'] = "Content generation failed. Please try again."
-                
-                # Calculate estimated reading time if not provided
-                if not result.get('reading_time'):
-                    estimated_words = result.get('word_count', word_count)
-                    reading_minutes = max(1, estimated_words // 200)
-                    result['reading_time'] = f"{reading_minutes} min read"
-                
-                return result
-                
-            except json.JSONDecodeError:
-                # Fallback response if JSON parsing fails
-                return {
-                    "headline": topic_title,
-                    "meta_description": f"Learn about {topic_title} and its impact on {target_audience}",
-                    "article_content": response.content,
-                    "word_count": word_count,
-                    "key_takeaways": ["Manual extraction needed"],
-                    "suggested_tags": ["content", "marketing", "business"],
-                    "reading_time": "5 min read",
-                    "call_to_action": "Learn more about our services",
-                    "parsing_note": "Raw content provided due to JSON parsing issue"
+        Returns:
+            list: BlogArticleResult objects in the same order as topic_data_list
+        """
+        try:
+            bodies = {}
+            contexts = {}
+            for index, topic_data in enumerate(topic_data_list):
+                custom_id = f"article-{index}"
+                prompt, contexts[custom_id] = self._build_article_prompt(topic_data, target_word_count, brand_voice)
+                bodies[custom_id] = {
+                    "model": self.model,
+                    "temperature": self.temperature,
+                    "response_format": response_format_for(BlogArticle),
+                    "messages": build_messages(prompt, system=_ARTICLE_SYSTEM_PROMPT)
                 }
-                
+            
+            contents = run_chat_batch(bodies, poll_interval=poll_interval)
         except Exception as e:
-            return {
-                "headline": "Content Generation Error",
-                "meta_description": "An error occurred during content generation",
-                "article_content": f"Error generating blog content: {str(e)}",
-                "word_count": 0,
-                "key_takeaways": ["Check API configuration and try again"],
-                "suggested_tags": ["error"],
-                "reading_time": "0 min read",
-                "call_to_action": "Please contact support",
-                "error": str(e)
-            }
+            return [self._article_error(e) for _ in topic_data_list]
+        
+        articles = []
+        for custom_id, content in contents.items():
+            try:
+                if content is None:
+                    raise RuntimeError("Batch request failed")
+                result = parse_structured(content, BlogArticle)
+                articles.append(self._finalize_article(result, **contexts[custom_id]))
+            except Exception as e:
+                articles.append(self._article_error(e))
+        return articles
+    
+    def _article_spec(self, topic_data, target_word_count, brand_voice):
+        """Collect the fields that specify one article"""
+        # Ensure word count is within specified range
+        word_count = max(300, min(600, topic_data.get('target_word_count', target_word_count)))
+        
+        content_angles = topic_data.get('content_angles', [])
+        angles_str = ", ".join(content_angles) if content_angles else "industry insights, practical tips"
+        
+        return {
+            "topic_title": topic_data.get('title', 'Trending Industry Topic'),
+            "word_count": word_count,
+            "target_audience": topic_data.get('target_audience', 'business professionals'),
+            "brand_voice": brand_voice,
+            "angles": angles_str
+        }
+    
+    def _build_article_prompt(self, topic_data, target_word_count, brand_voice):
+        """Build the article prompt and the context needed to finalize its response"""
+        spec = self._article_spec(topic_data, target_word_count, brand_voice)
+        prompt = _ARTICLE_PROMPT_TEMPLATE.format_map(spec)
+        
+        context = {
+            "topic_title": spec['topic_title'],
+            "word_count": spec['word_count']
+        }
+        return prompt, context
     
-    def optimize_for_seo(self, article_data, primary_keyword, secondary_keywords=None):
+    def _finalize_article(self, result, topic_title, word_count):
+        """Build the article result, filling in any empty fields of the generated article"""
+        # Calculate estimated reading time if not provided
+        reading_time = result.get('reading_time')
+        if not reading_time:
+            estimated_words = result.get('word_count') or word_count
+            reading_minutes = max(1, estimated_words // 200)
+            reading_time = f"{reading_minutes} min read"
+        
+        return BlogArticleResult(
+            headline=result.get('headline') or topic_title,
+            meta_description=result.get('meta_description', ''),
+            article_content=result.get('article_content') or "Content generation failed. Please try again.",
+            word_count=result.get('word_count', 0),
+            key_takeaways=tuple(result.get('key_takeaways', ())),
+            suggested_tags=tuple(result.get('suggested_tags', ())),
+            reading_time=reading_time,
+            call_to_action=result.get('call_to_action', '')
+        )
+    
+    def _article_error(self, error):
+        """Build the error result returned when article generation fails"""
+        return BlogArticleResult(
+            headline="Content Generation Error",
+            meta_description="An error occurred during content generation",
+            article_content=f"Error generating blog content: {str(error)}",
+            word_count=0,
+            key_takeaways=("Check API configuration and try again",),
+            suggested_tags=("error",),
+            reading_time="0 min read",
+            call_to_action="Please contact support",
+            error=str(error)
+        )
+    
+    def optimize_for_seo(self, article_data, primary_keyword, secondary_keywords=None, on_chunk=None):
         """
         Optimize blog article for SEO
         
         Args:
-            article_data (dict): Article content and metadata
+            article_data (BlogArticleResult): Article content and metadata (a plain dict also works)
             primary_keyword (str): Primary SEO keyword
             secondary_keywords (list): List of secondary keywords
+            on_chunk (callable): Stream the response, passing each content delta to this callback
             
         Returns:
-            dict: SEO-optimized article data
+            BlogArticleResult: SEO-optimized article data
         """
         try:
-            secondary_kw = secondary_keywords or []
-            secondary_str = ", ".join(secondary_kw) if secondary_kw else ""
-            
-            prompt = f"""
-            Optimize this blog article for SEO:
-            
-            Current headline: {article_data.get('headline', '')}
-            Current meta description: {article_data.get('meta_description', '')}
-            Primary keyword: {primary_keyword}
-            Secondary keywords: {secondary_str}
-            
-            Provide SEO optimizations:
-            1. Improved headline with primary keyword
-            2. Optimized meta description (150-160 characters)
-            3. Suggested internal linking opportunities
-            4. Keyword density recommendations
-            5. Featured snippet optimization suggestions
-            
-            Return response in JSON format:
-            {{
-                "optimized_headline": "SEO-optimized headline",
-                "optimized_meta_description": "Optimized meta description",
-                "keyword_density_target": "1-2%",
-                "internal_link_suggestions": ["suggestion1", "suggestion2"],
-                "featured_snippet_tips": ["tip1", "tip2"],
-                "seo_score": 8
-            }}
-            """
-            
-            response = self.llm.invoke(prompt)
-            
-            try:
-                seo_data = json.loads(response.content)
-                
-                # Apply optimizations to original article data
-                optimized_article = article_data.copy()
-                optimized_article['headline'] = seo_data.get('optimized_headline', article_data.get('headline'))
-                optimized_article['meta_description'] = seo_data.get('optimized_meta_description', article_data.get('meta_description'))
-                optimized_article['seo_optimizations'] = seo_data
-                
-                return optimized_article
-                
-            except json.JSONDecodeError:
-                # Return original data with SEO notes if parsing fails
-                article_data['seo_optimizations'] = {
-                    "note": "SEO optimization failed - manual review needed",
-                    "raw_suggestions": response.content
-                }
-                return article_data
-                
+            prompt = self._build_seo_prompt(article_data, primary_keyword, secondary_keywords)
+            seo_data = complete_structured(prompt, SeoOptimization, model=self.seo_model, temperature=self.seo_temperature,
+                                           system=_SEO_SYSTEM_PROMPT, on_chunk=on_chunk, cache=self.cache)
+            return self._apply_seo(seo_data, article_data)
+        except Exception as e:
+            return self._seo_error(article_data, e)
+    
+    async def aoptimize_for_seo(self, article_data, primary_keyword, secondary_keywords=None, on_chunk=None):
+        """Async variant of optimize_for_seo"""
+        try:
+            prompt = self._build_seo_prompt(article_data, primary_keyword, secondary_keywords)
+            seo_data = await acomplete_structured(prompt, SeoOptimization, model=self.seo_model,
+                                                  temperature=self.seo_temperature,
+                                                  system=_SEO_SYSTEM_PROMPT, on_chunk=on_chunk, cache=self.cache)
+            return self._apply_seo(seo_data, article_data)
         except Exception as e:
-            article_data['seo_optimizations'] = {
-                "error": str(e),
+            return self._seo_error(article_data, e)
+    
+    def _build_seo_prompt(self, article_data, primary_keyword, secondary_keywords):
+        """Build the SEO optimization prompt"""
+        secondary_kw = secondary_keywords or []
+        secondary_str = ", ".join(secondary_kw) if secondary_kw else ""
+        
+        return _SEO_PROMPT_TEMPLATE.format(
+            headline=article_data.get('headline', ''),
+            meta_description=article_data.get('meta_description', ''),
+            primary_keyword=primary_keyword,
+            secondary_keywords=secondary_str
+        )
+    
+    def _apply_seo(self, seo_data, article_data):
+        """Apply the SEO suggestions to a copy of the article"""
+        article = BlogArticleResult.from_dict(article_data)
+        return dataclasses.replace(
+            article,
+            headline=seo_data.get('optimized_headline') or article.headline,
+            meta_description=seo_data.get('optimized_meta_description') or article.meta_description,
+            seo_optimizations=seo_data
+        )
+    
+    def _seo_error(self, article_data, error):
+        """Return a copy of the article with the SEO error attached"""
+        return dataclasses.replace(
+            BlogArticleResult.from_dict(article_data),
+            seo_optimizations={
+                "error": str(error),
                 "note": "SEO optimization encountered an error"
             }
-            return article_data
+        )
@@ -0,0 +1,80 @@
+"""
+Agent result types for Content Marketing Pipeline
+Slotted, immutable result records with read-only dict-style access
+"""
+
+import functools
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+
+
+@functools.cache
+def _field_names(cls):
+    return tuple(field.name for field in fields(cls))
+
+
+class _ResultMapping(Mapping):
+    """
+    Dict-style read access for result dataclasses, so existing callers using
+    result['key'], result.get('key') or 'key' in result keep working.
+    Optional fields left as None are treated as absent keys.
+    """
+    __slots__ = ()
+    
+    def __getitem__(self, key):
+        if key in _field_names(type(self)):
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        raise KeyError(key)
+    
+    def __iter__(self):
+        return (name for name in _field_names(type(self)) if getattr(self, name) is not None)
+    
+    def __len__(self):
+        return sum(1 for _ in self)
+    
+    def to_dict(self):
+        """Return the result as a plain dict (tuples become lists)"""
+        return {
+            name: list(value) if isinstance(value, tuple) else value
+            for name, value in self.items()
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Build a result from a dict, ignoring unknown keys"""
+        if isinstance(data, cls):
+            return data
+        return cls(**{
+            name: tuple(data[name]) if isinstance(data[name], list) else data[name]
+            for name in _field_names(cls) if name in data
+        })
+
+
+@dataclass(slots=True, frozen=True)
+class BlogArticleResult(_ResultMapping):
+    """Blog article returned by the blog writer agent"""
+    headline: str = ""
+    meta_description: str = ""
+    article_content: str = ""
+    word_count: int = 0
+    key_takeaways: tuple[str, ...] = ()
+    suggested_tags: tuple[str, ...] = ()
+    reading_time: str = ""
+    call_to_action: str = ""
+    seo_optimizations: dict | None = None
+    error: str | None = None
+
+
+@dataclass(slots=True, frozen=True)
+class ScheduleResult(_ResultMapping):
+    """Posting schedule returned by the scheduler agent"""
+    campaign_overview: dict | None = None
+    blog_schedule: dict | None = None
+    linkedin_schedule: tuple[dict, ...] = ()
+    twitter_schedule: tuple[dict, ...] = ()
+    optimization_tips: tuple[str, ...] = ()
+    success_metrics: tuple[str, ...] = ()
+    csv_export: tuple[tuple[str, ...], ...] | None = None
+    error: str | None = None
@@ -3,44 +3,198 @@ Scheduler Agent for Content Marketing Pipeline
 Suggests optimal posting schedules for maximum engagement
 """
 
-import os
-import json
-from datetime import datetime, timedelta
-from crewai import Agent
-from langchain_openai import ChatOpenAI
+import bisect
+import calendar
+import itertools
+import asyncio
+import functools
+from datetime import date, datetime
+from utils.chat_models import get_llm
+from agents.schemas import PostingSchedule, FrequencyPlan
+from agents.results import ScheduleResult
+from utils.openai_client import complete_structured, acomplete_structured, StructuredOutputError
+from utils.jsonutil import dumps
 
 
-class SchedulerAgent:
-    """Agent responsible for optimizing content posting schedules"""
-    
-    def __init__(self):
-        # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
-        # do not change this unless explicitly requested by the user
-        self.llm = ChatOpenAI(
-            model="gpt-4o",
-            api_key=os.getenv("OPENAI_API_KEY"),
-            temperature=0.3  # Lower temperature for more consistent scheduling logic
-        )
-    
-    def create_agent(self):
-        """Create and return the scheduler agent"""
-        return Agent(
-            role="Content Scheduling Strategist",
-            goal="Optimize content publishing schedules to maximize reach, engagement, and business impact across different platforms",
-            backstory="""You are a data-driven content scheduling expert with deep knowledge of social media 
+CSV_COLUMNS = (
+    "Content_Type", "Platform", "Publish_Date", "Publish_Time",
+    "Day_of_Week", "Expected_Engagement", "Notes"
+)
+
+_SCHEDULER_BACKSTORY = """You are a data-driven content scheduling expert with deep knowledge of social media 
             algorithms, audience behavior patterns, and optimal posting times across different platforms and 
             industries. You understand how timing affects engagement rates, reach, and conversion metrics. 
             Your scheduling recommendations are based on platform-specific best practices, audience demographics, 
             time zones, and content type performance data. You excel at creating coordinated multi-platform 
-            campaigns that maximize cumulative impact while avoiding audience fatigue.""",
-            verbose=True,
-            allow_delegation=False,
-            llm=self.llm,
-            max_iter=3,
-            memory=True
+            campaigns that maximize cumulative impact while avoiding audience fatigue."""
+
+_SCHEDULE_SYSTEM_PROMPT = f"""{_SCHEDULER_BACKSTORY}
+
+Create optimal posting schedules for the content campaigns described by the user.
+
+Consider these factors:
+1. Platform-specific optimal posting times
+2. Audience behavior patterns for the target audience
+3. Content type and engagement goals
+4. Avoiding audience fatigue
+5. Building momentum across platforms
+6. Weekend vs weekday performance
+
+For each piece of content, specify:
+- Optimal day of week
+- Optimal time (in the campaign timezone)
+- Rationale for timing choice
+- Expected engagement level
+- Dependencies on other posts
+"""
+
+_FREQUENCY_SYSTEM_PROMPT = f"""{_SCHEDULER_BACKSTORY}
+
+Optimize posting frequency for the content campaigns described by the user.
+
+Provide recommendations for:
+1. Optimal posting frequency per platform
+2. Spacing between posts to avoid fatigue
+3. Peak engagement windows
+4. Content mix ratios (promotional vs educational vs engaging)
+"""
+
+# Per-call user prompts, filled with str.format; the start date and blog title change every run, so they come last
+_SCHEDULE_PROMPT_TEMPLATE = """Target audience: {target_audience}
+Timezone: {timezone}
+Campaign duration: {campaign_duration} days
+LinkedIn posts: {num_linkedin} posts
+Twitter posts: {num_twitter} posts
+Total posts (including the blog post): {total_posts}
+Start date: {start_date}
+Blog post: {blog_title}
+"""
+
+_FREQUENCY_PROMPT_TEMPLATE = """Audience data: {audience_data}
+Content volume: {content_volume} pieces
+Target platform: {platform}
+"""
+
+# Fallback posting slots keyed by (platform, audience tier): (rationale, ((weekday, day name, time), ...))
+_OPTIMAL_SLOTS = {
+    ("Blog", "B2B"): ("Tuesday morning for B2B audience engagement", (
+        (1, "Tuesday", "09:00"),
+    )),
+    ("LinkedIn", "B2B"): ("Business hours for professional audience", (
+        (2, "Wednesday", "10:00"),
+        (4, "Friday", "10:00"),
+    )),
+    ("Twitter", "B2B"): ("Evening hours for higher Twitter engagement", (
+        (1, "Tuesday", "18:00"),
+        (3, "Thursday", "18:00"),
+        (5, "Saturday", "18:00"),
+    )),
+    ("Blog", "B2C"): ("Weekend morning when consumers have time to read", (
+        (5, "Saturday", "10:00"),
+    )),
+    ("LinkedIn", "B2C"): ("Lunchtime browsing for professional consumers", (
+        (1, "Tuesday", "12:00"),
+        (3, "Thursday", "12:00"),
+    )),
+    ("Twitter", "B2C"): ("Evening and weekend leisure hours", (
+        (0, "Monday", "20:00"),
+        (2, "Wednesday", "20:00"),
+        (5, "Saturday", "11:00"),
+    )),
+}
+
+
+def _campaign_dates(start_date, days):
+    """Return ISO date strings for `days` consecutive days from start_date"""
+    start = start_date.toordinal()
+    return [date.fromordinal(start + offset).isoformat() for offset in range(days)]
+
+
+def _audience_tier(target_audience):
+    """Map a free-text audience description to a key of _OPTIMAL_SLOTS"""
+    audience = target_audience.lower()
+    return "B2C" if "b2c" in audience or "consumer" in audience else "B2B"
+
+
+def _next_slots(slots, after_offset, after_weekday, count, last_offset, after_time="24:00"):
+    """
+    Pick up to `count` posting slots after a given campaign day and time, cycling weekly
+    
+    Args:
+        slots (tuple): (weekday, day_name, time) slots sorted by weekday and time
+        after_offset (int): Day offset (from the campaign start) to schedule after
+        after_weekday (int): Weekday of that day (Monday is 0)
+        count (int): Number of slots to pick
+        last_offset (int): Last campaign day offset a slot may fall on
+        after_time (str): HH:MM time on that day to schedule after; the default skips the whole day
+        
+    Returns:
+        list: (day_offset, day_name, time) tuples in chronological order; fewer than `count` only
+            when the remaining days cannot hold them all
+    """
+    keys = [(weekday, time) for weekday, _, time in slots]
+    index = bisect.bisect_right(keys, (after_weekday, after_time))
+    picked = []
+    while len(picked) < count:
+        week, position = divmod(index, len(slots))
+        weekday, day_name, time = slots[position]
+        offset = after_offset + weekday - after_weekday + 7 * week
+        if offset > last_offset:
+            break
+        picked.append((offset, day_name, time))
+        index += 1
+    
+    if len(picked) < count:
+        # The campaign ends before enough weekly slots come round: compress the remaining posts
+        # into the slot times of the days left
+        taken = {(offset, time) for offset, _, time in picked}
+        times = sorted({time for _, _, time in slots})
+        extra = (
+            (offset, calendar.day_name[(after_weekday + offset - after_offset) % 7], time)
+            for offset in range(after_offset, last_offset + 1)
+            for time in times
+            if (offset, time) > (after_offset, after_time) and (offset, time) not in taken
         )
+        picked.extend(itertools.islice(extra, count - len(picked)))
+        picked.sort()
+    return picked
+
+
+class SchedulerAgent:
+    """Agent responsible for optimizing content posting schedules"""
+    
+    def __init__(self, model="gpt-4o-mini", cache=None):
+        # Scheduling is JSON shaping over short inputs, so it defaults to the smaller model
+        self.model = model
+        self.temperature = 0.2  # Lower temperature for more consistent scheduling logic
+        # Cache LLM responses on disk (None: only deterministic calls, when CACHE_ENABLED is set)
+        self.cache = cache
+        self._agent = None
+    
+    @functools.cached_property
+    def llm(self):
+        """LangChain chat model for the CrewAI agent, created on first use"""
+        return get_llm(self.model, self.temperature)
+    
+    def create_agent(self):
+        """Create and return the scheduler agent (built once per instance)"""
+        from crewai import Agent
+        
+        if self._agent is None:
+            self._agent = Agent(
+                role="Content Scheduling Strategist",
+                goal="Optimize content publishing schedules to maximize reach, engagement, and business impact across different platforms",
+                backstory=_SCHEDULER_BACKSTORY,
+                verbose=True,
+                allow_delegation=False,
+                llm=self.llm,
+                max_iter=3,
+                memory=True
+            )
+        return self._agent
     
-    def generate_posting_schedule(self, content_data, target_audience="B2B professionals", timezone="UTC", campaign_duration=7):
+    def generate_posting_schedule(self, content_data, target_audience="B2B professionals", timezone="UTC", campaign_duration=7,
+                                  on_chunk=None, post_counts=None):
         """
         Generate optimal posting schedule for content campaign
         
@@ -49,157 +203,188 @@ class SchedulerAgent:
             target_audience (str): Target audience description
             timezone (str): Target timezone for scheduling
             campaign_duration (int): Campaign duration in days
+            on_chunk (callable): Stream the response, passing each content delta to this callback
+            post_counts (tuple): Planned (LinkedIn, Twitter) post counts, for scheduling before the
+                social posts exist (default: counted from content_data)
             
         Returns:
-            dict: Complete posting schedule with timing recommendations
+            ScheduleResult: Complete posting schedule with timing recommendations
         """
         try:
-            # Get current date for scheduling
-            start_date = datetime.now()
-            
-            # Extract content information
-            blog_title = content_data.get('headline', 'Blog Post')
-            linkedin_posts = content_data.get('linkedin_content', {}).get('linkedin_posts', [])
-            twitter_posts = content_data.get('twitter_content', {}).get('twitter_posts', [])
-            
-            num_linkedin = len(linkedin_posts)
-            num_twitter = len(twitter_posts)
-            
-            prompt = f"""
-            Create an optimal posting schedule for this content campaign:
-            
-            Blog post: {blog_title}
-            LinkedIn posts: {num_linkedin} posts
-            Twitter posts: {num_twitter} posts
-            Target audience: {target_audience}
-            Timezone: {timezone}
-            Campaign duration: {campaign_duration} days
-            Start date: {start_date.strftime('%Y-%m-%d')}
-            
-            Consider these factors:
-            1. Platform-specific optimal posting times
-            2. Audience behavior patterns for {target_audience}
-            3. Content type and engagement goals
-            4. Avoiding audience fatigue
-            5. Building momentum across platforms
-            6. Weekend vs weekday performance
-            
-            For each piece of content, specify:
-            - Optimal day of week
-            - Optimal time (in {timezone})
-            - Rationale for timing choice
-            - Expected engagement level
-            - Dependencies on other posts
-            
-            Return response in JSON format:
-            {{
-                "campaign_overview": {{
-                    "start_date": "{start_date.strftime('%Y-%m-%d')}",
-                    "end_date": "calculated_end_date",
-                    "total_posts": {num_linkedin + num_twitter + 1},
-                    "strategy": "Overall campaign strategy"
-                }},
-                "blog_schedule": {{
-                    "publish_date": "YYYY-MM-DD",
-                    "publish_time": "HH:MM",
-                    "day_of_week": "Monday",
-                    "rationale": "Why this timing is optimal",
-                    "preparation_deadline": "YYYY-MM-DD HH:MM"
-                }},
-                "linkedin_schedule": [
-                    {{
-                        "post_index": 1,
-                        "publish_date": "YYYY-MM-DD",
-                        "publish_time": "HH:MM",
-                        "day_of_week": "Wednesday",
-                        "post_type": "thought-leadership",
-                        "rationale": "Timing explanation",
-                        "expected_engagement": "high"
-                    }}
-                ],
-                "twitter_schedule": [
-                    {{
-                        "post_index": 1,
-                        "publish_date": "YYYY-MM-DD",
-                        "publish_time": "HH:MM",
-                        "day_of_week": "Friday",
-                        "post_type": "engagement",
-                        "rationale": "Timing explanation",
-                        "expected_engagement": "medium"
-                    }}
-                ],
-                "optimization_tips": [
-                    "tip1",
-                    "tip2",
-                    "tip3"
-                ],
-                "success_metrics": [
-                    "metric1",
-                    "metric2"
-                ]
-            }}
-            """
-            
-            response = self.llm.invoke(prompt)
-            
+            prompt, context = self._build_schedule_prompt(content_data, target_audience, timezone, campaign_duration,
+                                                          post_counts)
             try:
-                result = json.loads(response.content)
-                
-                # Validate and enhance the schedule
-                if not result.get('campaign_overview'):
-                    result['campaign_overview'] = {
-                        "start_date": start_date.strftime('%Y-%m-%d'),
-                        "end_date": (start_date + timedelta(days=campaign_duration)).strftime('%Y-%m-%d'),
-                        "total_posts": num_linkedin + num_twitter + 1,
-                        "strategy": "Balanced cross-platform content distribution"
-                    }
-                
-                # Add CSV export data
-                result['csv_export'] = self._generate_csv_data(result)
-                
-                return result
-                
-            except json.JSONDecodeError:
-                # Generate fallback schedule
-                return self._generate_fallback_schedule(
-                    start_date, campaign_duration, num_linkedin, num_twitter, blog_title
-                )
-                
+                result = complete_structured(prompt, PostingSchedule, model=self.model, temperature=self.temperature,
+                                             system=_SCHEDULE_SYSTEM_PROMPT, on_chunk=on_chunk, cache=self.cache)
+            except StructuredOutputError:
+                return self._generate_fallback_schedule(**context)
+            return self._finalize_schedule(result)
+        except Exception as e:
+            return self._schedule_error(e)
+    
+    async def agenerate_posting_schedule(self, content_data, target_audience="B2B professionals", timezone="UTC", campaign_duration=7,
+                                         on_chunk=None, post_counts=None):
+        """Async variant of generate_posting_schedule"""
+        try:
+            prompt, context = self._build_schedule_prompt(content_data, target_audience, timezone, campaign_duration,
+                                                          post_counts)
+            try:
+                result = await acomplete_structured(prompt, PostingSchedule, model=self.model, temperature=self.temperature,
+                                                    system=_SCHEDULE_SYSTEM_PROMPT, on_chunk=on_chunk, cache=self.cache)
+            except StructuredOutputError:
+                return self._generate_fallback_schedule(**context)
+            return self._finalize_schedule(result)
         except Exception as e:
-            return {
-                "campaign_overview": {
-                    "start_date": datetime.now().strftime('%Y-%m-%d'),
-                    "error": str(e),
-                    "total_posts": 0,
-                    "strategy": "Manual scheduling required due to error"
-                },
-                "blog_schedule": {},
-                "linkedin_schedule": [],
-                "twitter_schedule": [],
-                "optimization_tips": ["Check API configuration", "Retry scheduling"],
-                "success_metrics": ["Manual tracking required"],
-                "error": str(e)
-            }
+            return self._schedule_error(e)
+    
+    async def aplan_campaign(self, content_data, audience_data, target_audience="B2B professionals",
+                             timezone="UTC", campaign_duration=7, platform="all"):
+        """
+        Generate the posting schedule and frequency recommendations concurrently
+        
+        Args:
+            content_data (dict): Blog and social media content data
+            audience_data (dict): Audience information and preferences
+            target_audience (str): Target audience description
+            timezone (str): Target timezone for scheduling
+            campaign_duration (int): Campaign duration in days
+            platform (str): Target platform or "all" for frequency optimization
+            
+        Returns:
+            dict: Posting schedule and frequency recommendations
+        """
+        linkedin_posts = content_data.get('linkedin_content', {}).get('linkedin_posts', [])
+        twitter_posts = content_data.get('twitter_content', {}).get('twitter_posts', [])
+        content_volume = len(linkedin_posts) + len(twitter_posts) + 1
+        
+        schedule, frequency = await asyncio.gather(
+            self.agenerate_posting_schedule(content_data, target_audience, timezone, campaign_duration),
+            self.aoptimize_posting_frequency(audience_data, content_volume, platform)
+        )
+        return {
+            "posting_schedule": schedule,
+            "frequency_optimization": frequency
+        }
+    
+    def _build_schedule_prompt(self, content_data, target_audience, timezone, campaign_duration, post_counts=None):
+        """Build the scheduling prompt and the context needed for the fallback schedule"""
+        # Get current date for scheduling
+        start_date = datetime.now()
+        
+        # Extract content information
+        blog_title = content_data.get('headline', 'Blog Post')
+        if post_counts:
+            num_linkedin, num_twitter = post_counts
+        else:
+            num_linkedin = len(content_data.get('linkedin_content', {}).get('linkedin_posts', []))
+            num_twitter = len(content_data.get('twitter_content', {}).get('twitter_posts', []))
+        
+        prompt = _SCHEDULE_PROMPT_TEMPLATE.format(
+            blog_title=blog_title,
+            num_linkedin=num_linkedin,
+            num_twitter=num_twitter,
+            target_audience=target_audience,
+            timezone=timezone,
+            campaign_duration=campaign_duration,
+            start_date=start_date.strftime('%Y-%m-%d'),
+            total_posts=num_linkedin + num_twitter + 1
+        )
+        
+        context = {
+            "start_date": start_date,
+            "duration": campaign_duration,
+            "num_linkedin": num_linkedin,
+            "num_twitter": num_twitter,
+            "blog_title": blog_title,
+            "audience_tier": _audience_tier(target_audience)
+        }
+        return prompt, context
+    
+    def _finalize_schedule(self, result):
+        """Build the schedule result, attaching CSV export data"""
+        return ScheduleResult(
+            campaign_overview=result['campaign_overview'],
+            blog_schedule=result['blog_schedule'],
+            linkedin_schedule=tuple(result['linkedin_schedule']),
+            twitter_schedule=tuple(result['twitter_schedule']),
+            optimization_tips=tuple(result['optimization_tips']),
+            success_metrics=tuple(result['success_metrics']),
+            csv_export=tuple(self._generate_csv_data(result))
+        )
+    
+    def _schedule_error(self, error):
+        """Build the error result returned when scheduling fails"""
+        return ScheduleResult(
+            campaign_overview={
+                "start_date": datetime.now().strftime('%Y-%m-%d'),
+                "error": str(error),
+                "total_posts": 0,
+                "strategy": "Manual scheduling required due to error"
+            },
+            blog_schedule={},
+            linkedin_schedule=(),
+            twitter_schedule=(),
+            optimization_tips=("Check API configuration", "Retry scheduling"),
+            success_metrics=("Manual tracking required",),
+            error=str(error)
+        )
     
-    def _generate_fallback_schedule(self, start_date, duration, num_linkedin, num_twitter, blog_title):
+    def _generate_fallback_schedule(self, start_date, duration, num_linkedin, num_twitter, blog_title, audience_tier="B2B"):
         """Generate a basic fallback schedule when AI parsing fails"""
+        blog_rationale, blog_slots = _OPTIMAL_SLOTS[("Blog", audience_tier)]
+        linkedin_rationale, linkedin_slots = _OPTIMAL_SLOTS[("LinkedIn", audience_tier)]
+        twitter_rationale, twitter_slots = _OPTIMAL_SLOTS[("Twitter", audience_tier)]
+        
+        # Blog goes out in its first slot in the first half of the campaign (or on the second day
+        # when there is none), leaving room for the social posts that follow it; nothing is
+        # scheduled past the campaign end date
+        start_weekday = start_date.weekday()
+        blog_offset, blog_day, blog_time = _next_slots(blog_slots, 0, start_weekday, 1, max(duration // 2, 1))[0]
+        blog_weekday = (start_weekday + blog_offset) % 7
+        linkedin_posts = _next_slots(linkedin_slots, blog_offset, blog_weekday, num_linkedin, duration, blog_time)
+        twitter_posts = _next_slots(twitter_slots, blog_offset, blog_weekday, num_twitter, duration, blog_time)
+        
+        # Date strings for every campaign day, computed once and indexed by day offset
+        dates = _campaign_dates(start_date, duration + 1)
         
         schedule = {
             "campaign_overview": {
-                "start_date": start_date.strftime('%Y-%m-%d'),
-                "end_date": (start_date + timedelta(days=duration)).strftime('%Y-%m-%d'),
-                "total_posts": num_linkedin + num_twitter + 1,
+                "start_date": dates[0],
+                "end_date": dates[duration],
+                "total_posts": len(linkedin_posts) + len(twitter_posts) + 1,
                 "strategy": "Standard weekly distribution - manual optimization recommended"
             },
             "blog_schedule": {
-                "publish_date": (start_date + timedelta(days=1)).strftime('%Y-%m-%d'),
-                "publish_time": "09:00",
-                "day_of_week": "Tuesday",
-                "rationale": "Tuesday morning for B2B audience engagement",
-                "preparation_deadline": start_date.strftime('%Y-%m-%d 17:00')
+                "publish_date": dates[blog_offset],
+                "publish_time": blog_time,
+                "day_of_week": blog_day,
+                "rationale": blog_rationale,
+                "preparation_deadline": f"{dates[blog_offset - 1]} 17:00"
             },
-            "linkedin_schedule": [],
-            "twitter_schedule": [],
+            "linkedin_schedule": [
+                {
+                    "post_index": i + 1,
+                    "publish_date": dates[offset],
+                    "publish_time": time,
+                    "day_of_week": day_name,
+                    "post_type": "professional",
+                    "rationale": linkedin_rationale,
+                    "expected_engagement": "medium"
+                }
+                for i, (offset, day_name, time) in enumerate(linkedin_posts)
+            ],
+            "twitter_schedule": [
+                {
+                    "post_index": i + 1,
+                    "publish_date": dates[offset],
+                    "publish_time": time,
+                    "day_of_week": day_name,
+                    "post_type": "engagement",
+                    "rationale": twitter_rationale,
+                    "expected_engagement": "medium"
+                }
+                for i, (offset, day_name, time) in enumerate(twitter_posts)
+            ],
             "optimization_tips": [
                 "Post blog content early in the week",
                 "Schedule LinkedIn during business hours",
@@ -212,78 +397,32 @@ class SchedulerAgent:
             ]
         }
         
-        # Add LinkedIn posts (Wednesday and Friday)
-        linkedin_days = [3, 5]  # Wednesday, Friday
-        for i in range(min(num_linkedin, len(linkedin_days))):
-            post_date = start_date + timedelta(days=linkedin_days[i])
-            schedule["linkedin_schedule"].append({
-                "post_index": i + 1,
-                "publish_date": post_date.strftime('%Y-%m-%d'),
-                "publish_time": "10:00",
-                "day_of_week": post_date.strftime('%A'),
-                "post_type": "professional",
-                "rationale": "Business hours for professional audience",
-                "expected_engagement": "medium"
-            })
-        
-        # Add Twitter posts (spread throughout week)
-        twitter_days = [2, 4, 6]  # Tuesday, Thursday, Saturday
-        for i in range(min(num_twitter, len(twitter_days))):
-            post_date = start_date + timedelta(days=twitter_days[i])
-            schedule["twitter_schedule"].append({
-                "post_index": i + 1,
-                "publish_date": post_date.strftime('%Y-%m-%d'),
-                "publish_time": "18:00",
-                "day_of_week": post_date.strftime('%A'),
-                "post_type": "engagement",
-                "rationale": "Evening hours for higher Twitter engagement",
-                "expected_engagement": "medium"
-            })
-        
-        schedule['csv_export'] = self._generate_csv_data(schedule)
-        
-        return schedule
+        return self._finalize_schedule(schedule)
     
     def _generate_csv_data(self, schedule_data):
-        """Generate CSV-formatted schedule data"""
-        csv_rows = []
+        """Generate CSV-formatted schedule data as a header row followed by one tuple per post"""
+        csv_rows = [CSV_COLUMNS]
         
         # Add blog schedule
-        if schedule_data.get('blog_schedule'):
-            blog = schedule_data['blog_schedule']
-            csv_rows.append({
-                "Content_Type": "Blog Post",
-                "Platform": "Website",
-                "Publish_Date": blog.get('publish_date', ''),
-                "Publish_Time": blog.get('publish_time', ''),
-                "Day_of_Week": blog.get('day_of_week', ''),
-                "Expected_Engagement": "High",
-                "Notes": blog.get('rationale', '')
-            })
+        blog = schedule_data.get('blog_schedule')
+        if blog:
+            csv_rows.append((
+                "Blog Post", "Website",
+                blog.get('publish_date', ''), blog.get('publish_time', ''), blog.get('day_of_week', ''),
+                "High", blog.get('rationale', '')
+            ))
         
-        # Add LinkedIn schedule
-        for post in schedule_data.get('linkedin_schedule', []):
-            csv_rows.append({
-                "Content_Type": f"LinkedIn Post {post.get('post_index', '')}",
-                "Platform": "LinkedIn",
-                "Publish_Date": post.get('publish_date', ''),
-                "Publish_Time": post.get('publish_time', ''),
-                "Day_of_Week": post.get('day_of_week', ''),
-                "Expected_Engagement": post.get('expected_engagement', 'Medium'),
-                "Notes": post.get('rationale', '')
-            })
-        
-        # Add Twitter schedule
-        for post in schedule_data.get('twitter_schedule', []):
-            csv_rows.append({
-                "Content_Type": f"Twitter Post {post.get('post_index', '')}",
-                "Platform": "Twitter/X",
-                "Publish_Date": post.get('publish_date', ''),
-                "Publish_Time": post.get('publish_time', ''),
-                "Day_of_Week": post.get('day_of_week', ''),
-                "Expected_Engagement": post.get('expected_engagement', 'Medium'),
-                "Notes": post.get('rationale', '')
-            })
+        # Add LinkedIn and Twitter schedules
+        for key, label, platform in (("linkedin_schedule", "LinkedIn Post", "LinkedIn"),
+                                     ("twitter_schedule", "Twitter Post", "Twitter/X")):
+            csv_rows.extend(
+                (
+                    f"{label} {post.get('post_index', '')}", platform,
+                    post.get('publish_date', ''), post.get('publish_time', ''), post.get('day_of_week', ''),
+                    post.get('expected_engagement', 'Medium'), post.get('rationale', '')
+                )
+                for post in schedule_data.get(key, [])
+            )
         
         return csv_rows
     
@@ -300,68 +439,33 @@ class SchedulerAgent:
             dict: Frequency optimization recommendations
         """
         try:
-            prompt = f"""
-            Optimize posting frequency for this content campaign:
-            
-            Audience data: {json.dumps(audience_data)}
-            Content volume: {content_volume} pieces
-            Target platform: {platform}
-            
-            Provide recommendations for:
-            1. Optimal posting frequency per platform
-            2. Spacing between posts to avoid fatigue
-            3. Peak engagement windows
-            4. Content mix ratios (promotional vs educational vs engaging)
-            
-            Return response in JSON format:
-            {{
-                "frequency_recommendations": {{
-                    "linkedin": "X posts per week",
-                    "twitter": "X posts per day",
-                    "blog": "X posts per month"
-                }},
-                "spacing_guidelines": {{
-                    "minimum_hours_between_posts": 4,
-                    "optimal_daily_limit": 3,
-                    "weekend_adjustment": "reduce by 50%"
-                }},
-                "engagement_windows": [
-                    {{
-                        "platform": "LinkedIn",
-                        "best_times": ["09:00", "12:00", "17:00"],
-                        "best_days": ["Tuesday", "Wednesday", "Thursday"]
-                    }}
-                ],
-                "content_mix_ratio": {{
-                    "educational": "60%",
-                    "promotional": "20%",
-                    "engaging": "20%"
-                }}
-            }}
-            """
-            
-            response = self.llm.invoke(prompt)
-            
-            try:
-                return json.loads(response.content)
-            except json.JSONDecodeError:
-                return {
-                    "frequency_recommendations": {
-                        "linkedin": "3-5 posts per week",
-                        "twitter": "3-7 posts per day",
-                        "blog": "2-4 posts per month"
-                    },
-                    "spacing_guidelines": {
-                        "minimum_hours_between_posts": 4,
-                        "optimal_daily_limit": 3,
-                        "weekend_adjustment": "reduce by 50%"
-                    },
-                    "note": "Default recommendations provided - manual optimization suggested"
-                }
-                
+            prompt = self._build_frequency_prompt(audience_data, content_volume, platform)
+            return complete_structured(prompt, FrequencyPlan, model=self.model, temperature=self.temperature,
+                                       system=_FREQUENCY_SYSTEM_PROMPT, cache=self.cache)
         except Exception as e:
-            return {
-                "frequency_recommendations": {"error": str(e)},
-                "spacing_guidelines": {"error": str(e)},
-                "note": "Error occurred during frequency optimization"
-            }
+            return self._frequency_error(e)
+    
+    async def aoptimize_posting_frequency(self, audience_data, content_volume, platform="all"):
+        """Async variant of optimize_posting_frequency"""
+        try:
+            prompt = self._build_frequency_prompt(audience_data, content_volume, platform)
+            return await acomplete_structured(prompt, FrequencyPlan, model=self.model, temperature=self.temperature,
+                                              system=_FREQUENCY_SYSTEM_PROMPT, cache=self.cache)
+        except Exception as e:
+            return self._frequency_error(e)
+    
+    def _build_frequency_prompt(self, audience_data, content_volume, platform):
+        """Build the posting frequency prompt"""
+        return _FREQUENCY_PROMPT_TEMPLATE.format(
+            audience_data=dumps(audience_data),
+            content_volume=content_volume,
+            platform=platform
+        )
+    
+    def _frequency_error(self, error):
+        """Build the error payload returned when frequency optimization fails"""
+        return {
+            "frequency_recommendations": {"error": str(error)},
+            "spacing_guidelines": {"error": str(error)},
+            "note": "Error occurred during frequency optimization"
+        }
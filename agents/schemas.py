@@ -0,0 +1,198 @@
+"""
+Structured output schemas for Content Marketing Pipeline
+Pydantic models describing the JSON each agent requests from the LLM
+"""
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class StrictModel(BaseModel):
+    """Base model compatible with OpenAI strict structured outputs"""
+    model_config = ConfigDict(extra="forbid")
+
+
+class BlogArticle(StrictModel):
+    """Blog article produced by the blog writer agent"""
+    headline: str = Field(description="Compelling blog headline")
+    meta_description: str = Field(description="SEO meta description (150-160 characters)")
+    article_content: str = Field(description="Full article content in markdown format")
+    word_count: int = Field(description="Word count of article_content")
+    key_takeaways: list[str] = Field(description="3-5 key takeaways")
+    suggested_tags: list[str] = Field(description="Suggested tags for the article")
+    reading_time: str = Field(description="Estimated reading time, e.g. '5 min read'")
+    call_to_action: str = Field(description="Specific call-to-action text")
+
+
+class BlogArticleBatch(StrictModel):
+    """Several blog articles written in one request, in input order"""
+    articles: list[BlogArticle] = Field(description="One article per input specification, in the same order")
+
+
+class SectionSpec(StrictModel):
+    """One body section of a planned blog article"""
+    heading: str = Field(description="Section subheading")
+    key_points: list[str] = Field(description="Points the section must cover")
+    word_count: int = Field(description="Word budget for the section")
+
+
+class ArticlePlan(StrictModel):
+    """Outline produced before the sections of a blog article are drafted in parallel"""
+    headline: str = Field(description="Compelling blog headline")
+    meta_description: str = Field(description="SEO meta description (150-160 characters)")
+    hook: str = Field(description="Opening paragraph that hooks the reader")
+    sections: list[SectionSpec] = Field(description="3-4 main sections followed by a conclusion section")
+    key_takeaways: list[str] = Field(description="3-5 key takeaways")
+    suggested_tags: list[str] = Field(description="Suggested tags for the article")
+    call_to_action: str = Field(description="Specific call-to-action text")
+
+
+class SeoOptimization(StrictModel):
+    """SEO recommendations for an existing blog article"""
+    optimized_headline: str = Field(description="SEO-optimized headline containing the primary keyword")
+    optimized_meta_description: str = Field(description="Optimized meta description (150-160 characters)")
+    keyword_density_target: str = Field(description="Target keyword density, e.g. '1-2%'")
+    internal_link_suggestions: list[str]
+    featured_snippet_tips: list[str]
+    seo_score: int = Field(description="SEO score from 1 to 10")
+
+
+class CampaignOverview(StrictModel):
+    start_date: str = Field(description="YYYY-MM-DD")
+    end_date: str = Field(description="YYYY-MM-DD")
+    total_posts: int
+    strategy: str = Field(description="Overall campaign strategy")
+
+
+class BlogSchedule(StrictModel):
+    publish_date: str = Field(description="YYYY-MM-DD")
+    publish_time: str = Field(description="HH:MM")
+    day_of_week: str
+    rationale: str = Field(description="Why this timing is optimal")
+    preparation_deadline: str = Field(description="YYYY-MM-DD HH:MM")
+
+
+class ScheduledPost(StrictModel):
+    post_index: int
+    publish_date: str = Field(description="YYYY-MM-DD")
+    publish_time: str = Field(description="HH:MM")
+    day_of_week: str
+    post_type: str = Field(description="e.g. thought-leadership, engagement")
+    rationale: str = Field(description="Timing explanation")
+    expected_engagement: str = Field(description="high, medium or low")
+
+
+class PostingSchedule(StrictModel):
+    """Posting schedule produced by the scheduler agent"""
+    campaign_overview: CampaignOverview
+    blog_schedule: BlogSchedule
+    linkedin_schedule: list[ScheduledPost]
+    twitter_schedule: list[ScheduledPost]
+    optimization_tips: list[str]
+    success_metrics: list[str]
+
+
+class FrequencyRecommendations(StrictModel):
+    linkedin: str = Field(description="e.g. '3 posts per week'")
+    twitter: str = Field(description="e.g. '2 posts per day'")
+    blog: str = Field(description="e.g. '4 posts per month'")
+
+
+class SpacingGuidelines(StrictModel):
+    minimum_hours_between_posts: int
+    optimal_daily_limit: int
+    weekend_adjustment: str = Field(description="e.g. 'reduce by 50%'")
+
+
+class EngagementWindow(StrictModel):
+    platform: str
+    best_times: list[str] = Field(description="HH:MM times")
+    best_days: list[str]
+
+
+class ContentMixRatio(StrictModel):
+    educational: str = Field(description="Percentage, e.g. '60%'")
+    promotional: str = Field(description="Percentage, e.g. '20%'")
+    engaging: str = Field(description="Percentage, e.g. '20%'")
+
+
+class FrequencyPlan(StrictModel):
+    """Posting frequency recommendations produced by the scheduler agent"""
+    frequency_recommendations: FrequencyRecommendations
+    spacing_guidelines: SpacingGuidelines
+    engagement_windows: list[EngagementWindow]
+    content_mix_ratio: ContentMixRatio
+
+
+class LinkedInPost(StrictModel):
+    post_content: str = Field(description="Full LinkedIn post text with line breaks")
+    character_count: int
+    hashtags: list[str] = Field(description="5-10 relevant hashtags")
+    post_type: str = Field(description="educational, thought-leadership or promotional")
+    engagement_prediction: str = Field(description="high, medium or low")
+    call_to_action: str = Field(description="Engagement question or call-to-action")
+    posting_tip: str = Field(description="Best time to post this type of content")
+
+
+class LinkedInBatch(StrictModel):
+    """LinkedIn posts produced by the social post agent"""
+    linkedin_posts: list[LinkedInPost]
+    content_themes: list[str]
+    overall_strategy: str = Field(description="Strategic notes for the post series")
+
+
+class TwitterPost(StrictModel):
+    tweet_content: str = Field(description="Tweet text with hashtags, under 280 characters")
+    character_count: int
+    post_type: str = Field(description="e.g. single_tweet, quote_tweet, question")
+    hashtags: list[str] = Field(description="2-3 hashtags")
+    engagement_elements: list[str] = Field(description="e.g. question, emoji, statistic")
+    thread_position: int | None
+    retweet_potential: str = Field(description="high, medium or low")
+
+
+class TwitterThread(StrictModel):
+    thread_content: list[str] = Field(description="Tweets in order, e.g. 'Tweet 1/n'")
+    thread_topic: str = Field(description="Main thread theme")
+    total_tweets: int
+
+
+class TwitterBatch(StrictModel):
+    """Twitter/X posts produced by the social post agent"""
+    twitter_posts: list[TwitterPost]
+    thread_posts: list[TwitterThread]
+    posting_strategy: str = Field(description="Strategy notes for optimal timing and sequence")
+
+
+class SocialCampaign(StrictModel):
+    """LinkedIn and Twitter/X posts generated together in one request"""
+    linkedin_posts: list[LinkedInPost]
+    content_themes: list[str]
+    overall_strategy: str = Field(description="Strategic notes for the LinkedIn series")
+    twitter_posts: list[TwitterPost]
+    thread_posts: list[TwitterThread]
+    posting_strategy: str = Field(description="Strategy notes for optimal timing and sequence")
+
+
+class TrendingTopic(StrictModel):
+    title: str
+    trending_reason: str = Field(description="Why this topic is trending")
+    target_audience: str = Field(description="Who would be interested")
+    content_angles: list[str]
+    seo_score: int = Field(description="SEO potential from 1 to 10")
+    urgency_level: str = Field(description="high, medium or low")
+
+
+class TopicsBatch(StrictModel):
+    """Trending topics produced by the topic research agent"""
+    trending_topics: list[TrendingTopic] = Field(description="3-5 trending content topics")
+    market_insights: str = Field(description="Overall market observations")
+    recommended_focus: str = Field(description="Which topic to prioritize and why")
+
+
+class CompetitionAnalysis(StrictModel):
+    """Competition analysis produced by the topic research agent"""
+    competition_level: str = Field(description="low, medium or high")
+    content_gaps: list[str]
+    differentiation_strategies: list[str]
+    recommended_formats: list[str] = Field(description="e.g. blog, video, infographic")
+    success_probability: int = Field(description="Likelihood of success from 1 to 10")
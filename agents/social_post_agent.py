@@ -3,40 +3,193 @@ Social Post Agent for Content Marketing Pipeline
 Generates LinkedIn and Twitter/X posts from blog content
 """
 
-import os
-import json
-from crewai import Agent
-from langchain_openai import ChatOpenAI
+import queue
+import functools
+import asyncio
+import threading
+import jiter
+from utils.chat_models import get_llm
+from agents.schemas import LinkedInPost, LinkedInBatch, TwitterPost, TwitterBatch, SocialCampaign
+from utils.openai_client import (
+    complete_structured, acomplete_structured, parse_structured, response_format_for, build_messages, StructuredOutputError,
+    run_sync
+)
+from utils.openai_batch import run_chat_batch
+
+
+_SOCIAL_BACKSTORY = """You are a social media expert with deep understanding of different platform 
+            algorithms, audience behaviors, and content formats that drive engagement. You know how to 
+            adapt content for LinkedIn's professional audience and Twitter/X's fast-paced, conversational 
+            environment. Your posts consistently achieve high engagement rates through strategic use of 
+            hashtags, compelling hooks, and platform-specific best practices. You understand the nuances 
+            of professional networking on LinkedIn and viral content mechanics on Twitter/X."""
+
+_LINKEDIN_SYSTEM_PROMPT = f"""{_SOCIAL_BACKSTORY}
+
+Create engaging LinkedIn posts from the blog article described by the user.
+
+For each LinkedIn post, create:
+1. Hook opening (1-2 lines that grab attention)
+2. Value-driven body content (3-5 lines)
+3. Call-to-action or engagement question
+4. Relevant hashtags (5-10)
+5. Post type classification (educational, thought-leadership, promotional)
+
+LinkedIn best practices:
+- Keep under 1300 characters for optimal engagement
+- Use line breaks for readability
+- Include emojis strategically
+- End with engagement-driving questions
+- Use professional but conversational tone
+"""
+
+_TWITTER_SYSTEM_PROMPT = f"""{_SOCIAL_BACKSTORY}
+
+Create engaging Twitter/X posts from the blog article described by the user.
+
+Create a mix of:
+1. Single tweets (under 280 characters)
+2. Quote tweets with compelling statistics/insights
+3. Question tweets to drive engagement
+4. Thread starters, when the user asks for threads
+
+Twitter/X best practices:
+- Keep single tweets under 280 characters
+- Use relevant hashtags (2-3 max)
+- Include engaging hooks
+- Use emojis strategically
+- Create conversation starters
+- Mix promotional with value-driven content
+"""
+
+_CAMPAIGN_SYSTEM_PROMPT = f"""{_SOCIAL_BACKSTORY}
+
+Create a coordinated LinkedIn and Twitter/X campaign for the blog article described by the user.
+
+LinkedIn posts:
+- Hook opening, value-driven body, call-to-action or engagement question
+- 5-10 relevant hashtags
+- Under 1300 characters, professional but conversational tone
+
+Twitter/X posts and one thread:
+- Mix single tweets, insight/statistic tweets and question tweets
+- Under 280 characters per tweet, 2-3 hashtags max
+"""
+
+# Per-call user prompts. The post options are rendered once per combination (see the
+# _render_* helpers); the blog details are then substituted for the {BLOG} marker
+_BLOG_MARKER = "{BLOG}"
+
+_LINKEDIN_PROMPT_TEMPLATE = """Number of posts: {num_posts}
+Post style: {post_style}
+{{BLOG}}"""
+
+_TWITTER_PROMPT_TEMPLATE = """Number of posts: {num_posts}
+Include threads: {include_threads}
+{{BLOG}}"""
+
+_CAMPAIGN_PROMPT_TEMPLATE = """Number of LinkedIn posts: {num_linkedin}
+Number of Twitter/X posts: {num_twitter}
+{{BLOG}}"""
+
+_BLOG_PREVIEW_TEMPLATE = """Blog headline: {headline}
+Content preview: {content_preview}
+Key takeaways: {takeaways_str}
+"""
+
+_BLOG_TAKEAWAYS_TEMPLATE = """Blog headline: {headline}
+Key takeaways: {takeaways}
+"""
+
+
+# Article context sent with the social prompts, measured in gpt-4o tokens
+PREVIEW_TOKENS = 75
+
+
+@functools.cache
+def _encoding():
+    """Load the gpt-4o tokenizer once, or return None if it is unavailable (e.g. offline)"""
+    try:
+        import tiktoken
+        return tiktoken.encoding_for_model("gpt-4o")
+    except Exception:
+        return None
+
+
+def _content_preview(article_content, max_tokens=PREVIEW_TOKENS):
+    """
+    Trim an article to its first max_tokens tokens for use as prompt context
+    
+    Args:
+        article_content (str): Full article text
+        max_tokens (int): Token budget for the preview
+        
+    Returns:
+        str: The article, or its opening followed by "..." if it is over budget
+    """
+    encoding = _encoding()
+    if encoding is None:
+        # Roughly four characters per token
+        limit = max_tokens * 4
+        return article_content[:limit] + "..." if len(article_content) > limit else article_content
+    
+    # Only the head of the article can fit, so don't tokenize the rest of it
+    tokens = encoding.encode(article_content[:max_tokens * 8])
+    if len(tokens) <= max_tokens and len(article_content) <= max_tokens * 8:
+        return article_content
+    return encoding.decode(tokens[:max_tokens]) + "..."
+
+
+@functools.lru_cache(maxsize=64)
+def _render_linkedin_prompt(num_posts, post_style):
+    return _LINKEDIN_PROMPT_TEMPLATE.format(num_posts=num_posts, post_style=post_style)
+
+
+@functools.lru_cache(maxsize=64)
+def _render_twitter_prompt(num_posts, include_threads):
+    return _TWITTER_PROMPT_TEMPLATE.format(num_posts=num_posts, include_threads=include_threads)
+
+
+@functools.lru_cache(maxsize=64)
+def _render_campaign_prompt(num_linkedin, num_twitter):
+    return _CAMPAIGN_PROMPT_TEMPLATE.format(num_linkedin=num_linkedin, num_twitter=num_twitter)
+
+
+class _StreamCancelled(Exception):
+    """Raised from a stream callback to abandon a request nobody is waiting for"""
 
 
 class SocialPostAgent:
     """Agent responsible for creating social media posts from blog content"""
     
-    def __init__(self):
+    def __init__(self, cache=None, cache_ttl=None, use_memory=False):
         # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
         # do not change this unless explicitly requested by the user
-        self.llm = ChatOpenAI(
-            model="gpt-4o",
-            api_key=os.getenv("OPENAI_API_KEY"),
-            temperature=0.9
-        )
+        self.model = "gpt-4o"
+        self.temperature = 0.9
+        # Cache LLM responses on disk, reusing them for up to cache_ttl seconds (None: no expiry)
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        self.use_memory = use_memory
+    
+    @functools.cached_property
+    def llm(self):
+        """LangChain chat model for the CrewAI agent, created on first use"""
+        return get_llm(self.model, self.temperature)
     
     def create_agent(self):
         """Create and return the social post agent"""
+        from crewai import Agent
+        
         return Agent(
             role="Social Media Content Specialist",
             goal="Transform blog content into engaging, platform-optimized social media posts that drive engagement and traffic",
-            backstory="""You are a social media expert with deep understanding of different platform 
-            algorithms, audience behaviors, and content formats that drive engagement. You know how to 
-            adapt content for LinkedIn's professional audience and Twitter/X's fast-paced, conversational 
-            environment. Your posts consistently achieve high engagement rates through strategic use of 
-            hashtags, compelling hooks, and platform-specific best practices. You understand the nuances 
-            of professional networking on LinkedIn and viral content mechanics on Twitter/X.""",
+            backstory=_SOCIAL_BACKSTORY,
             verbose=True,
             allow_delegation=False,
             llm=self.llm,
-            max_iter=3,
-            memory=True
+            max_iter=1,
+            memory=self.use_memory
         )
     
     def generate_linkedin_posts(self, blog_data, num_posts=3, post_style="professional"):
@@ -52,105 +205,149 @@ class SocialPostAgent:
             dict: Generated LinkedIn posts with metadata
         """
         try:
-            headline = blog_data.get('headline', 'Industry Insights')
-            key_takeaways = blog_data.get('key_takeaways', [])
-            article_content = blog_data.get('article_content', '')
-            
-            # Extract first paragraph for context
-            content_preview = article_content[:300] + "..." if len(article_content) > 300 else article_content
-            takeaways_str = "\n".join([f"• {takeaway}" for takeaway in key_takeaways[:3]])
-            
-            prompt = f"""
-            Create {num_posts} engaging LinkedIn posts based on this blog article:
-            
-            Blog headline: {headline}
-            Content preview: {content_preview}
-            Key takeaways: {takeaways_str}
-            Post style: {post_style}
-            
-            For each LinkedIn post, create:
-            1. Hook opening (1-2 lines that grab attention)
-            2. Value-driven body content (3-5 lines)
-            3. Call-to-action or engagement question
-            4. Relevant hashtags (5-10)
-            5. Post type classification (educational, thought-leadership, promotional)
-            
-            LinkedIn best practices:
-            - Keep under 1300 characters for optimal engagement
-            - Use line breaks for readability
-            - Include emojis strategically
-            - End with engagement-driving questions
-            - Use professional but conversational tone
-            
-            Return response in JSON format:
-            {{
-                "linkedin_posts": [
-                    {{
-                        "post_content": "Full LinkedIn post text with line breaks",
-                        "character_count": 850,
-                        "hashtags": ["#hashtag1", "#hashtag2"],
-                        "post_type": "educational",
-                        "engagement_prediction": "high",
-                        "call_to_action": "What's your experience with this?",
-                        "posting_tip": "Best time to post this type of content"
-                    }}
-                ],
-                "content_themes": ["theme1", "theme2"],
-                "overall_strategy": "Strategic notes for the post series"
-            }}
-            """
-            
-            response = self.llm.invoke(prompt)
+            prompt, context = self._build_linkedin_prompt(blog_data, num_posts, post_style)
+            result = self._complete(prompt, LinkedInBatch, _LINKEDIN_SYSTEM_PROMPT)
+            return self._ensure_linkedin_posts(result, **context)
+        except Exception as e:
+            return self._linkedin_error(e)
+    
+    async def agenerate_linkedin_posts(self, blog_data, num_posts=3, post_style="professional"):
+        """Async variant of generate_linkedin_posts"""
+        try:
+            prompt, context = self._build_linkedin_prompt(blog_data, num_posts, post_style)
+            result = await self._acomplete(prompt, LinkedInBatch, _LINKEDIN_SYSTEM_PROMPT)
+            return self._ensure_linkedin_posts(result, **context)
+        except Exception as e:
+            return self._linkedin_error(e)
+    
+    def _complete(self, prompt, schema, system, on_chunk=None):
+        """Run a structured completion with the agent's model and cache settings"""
+        return complete_structured(prompt, schema, model=self.model, temperature=self.temperature, system=system,
+                                   on_chunk=on_chunk, cache=self.cache, cache_ttl=self.cache_ttl)
+    
+    async def _acomplete(self, prompt, schema, system):
+        """Async variant of _complete"""
+        return await acomplete_structured(prompt, schema, model=self.model, temperature=self.temperature,
+                                          system=system, cache=self.cache, cache_ttl=self.cache_ttl)
+    
+    def generate_linkedin_posts_stream(self, blog_data, num_posts=3, post_style="professional"):
+        """
+        Stream LinkedIn posts, yielding each one as soon as the model has finished writing it
+        
+        The response is streamed on a worker thread and the partial JSON is re-parsed whenever
+        an object closes, so early posts reach the caller while later ones are still generating.
+        
+        Args:
+            blog_data (dict): Blog article data
+            num_posts (int): Number of LinkedIn posts to generate
+            post_style (str): Style of posts (professional, thought-leadership, educational)
             
+        Yields:
+            dict: LinkedIn posts in order (a single error post if generation fails)
+        """
+        events = queue.SimpleQueue()
+        # Set when the caller closes or abandons the generator, to stop the request mid-stream
+        cancelled = threading.Event()
+        
+        def on_chunk(delta):
+            if cancelled.is_set():
+                raise _StreamCancelled()
+            events.put(("chunk", delta))
+        
+        def produce():
             try:
-                result = json.loads(response.content)
-                
-                # Validate and enhance response
-                if not result.get('linkedin_posts'):
-                    result['linkedin_posts'] = [{
-                        "post_content": f"🚀 Just published: {headline}\n\n{takeaways_str}\n\nWhat are your thoughts?",
-                        "character_count": 200,
-                        "hashtags": ["#contentmarketing", "#business"],
-                        "post_type": "promotional",
-                        "engagement_prediction": "medium",
-                        "call_to_action": "Share your thoughts below",
-                        "posting_tip": "Post during business hours for better reach"
-                    }]
-                
-                return result
-                
-            except json.JSONDecodeError:
-                # Fallback response
-                return {
-                    "linkedin_posts": [{
-                        "post_content": response.content[:1000],
-                        "character_count": len(response.content[:1000]),
-                        "hashtags": ["#contentmarketing", "#business", "#insights"],
-                        "post_type": "general",
-                        "engagement_prediction": "medium",
-                        "call_to_action": "What do you think?",
-                        "posting_tip": "Review and edit before posting"
-                    }],
-                    "content_themes": ["business insights"],
-                    "overall_strategy": "Manual review recommended due to parsing issue",
-                    "parsing_note": "Raw content provided"
-                }
+                prompt, context = self._build_linkedin_prompt(blog_data, num_posts, post_style)
+                result = self._complete(prompt, LinkedInBatch, _LINKEDIN_SYSTEM_PROMPT, on_chunk=on_chunk)
+                events.put(("done", self._ensure_linkedin_posts(result, **context)))
+            except _StreamCancelled:
+                pass
+            except Exception as e:
+                events.put(("done", self._linkedin_error(e)))
+        
+        threading.Thread(target=produce, daemon=True).start()
+        
+        # Deltas all come from one generation: the client does not retry a stream once it has
+        # delivered output, so posts yielded from the buffer are never mixed with a second attempt
+        buffer = bytearray()
+        yielded = 0
+        try:
+            while True:
+                kind, payload = events.get()
+                if kind == "done":
+                    # An error post is always surfaced, even after some posts have been streamed
+                    posts = payload['linkedin_posts']
+                    yield from posts if 'error' in payload else posts[yielded:]
+                    return
                 
-        except Exception as e:
-            return {
-                "linkedin_posts": [{
-                    "post_content": f"Error generating LinkedIn content: {str(e)}",
-                    "character_count": 0,
-                    "hashtags": ["#error"],
-                    "post_type": "error",
-                    "engagement_prediction": "none",
-                    "call_to_action": "Please try again",
-                    "posting_tip": "Check API configuration"
-                }],
-                "content_themes": ["error"],
-                "overall_strategy": "Fix configuration and retry",
-                "error": str(e)
-            }
+                buffer += payload.encode("utf-8")
+                if "}" not in payload:
+                    continue
+                try:
+                    partial = jiter.from_json(bytes(buffer), partial_mode="trailing-strings")
+                except ValueError:
+                    continue
+                # Every post except the last one in the partial document is complete
+                posts = partial.get('linkedin_posts', []) if isinstance(partial, dict) else []
+                while yielded < len(posts) - 1:
+                    yield posts[yielded]
+                    yielded += 1
+        finally:
+            cancelled.set()
+    
+    def _build_linkedin_prompt(self, blog_data, num_posts, post_style):
+        """Build the LinkedIn prompt and the context needed to complete its response"""
+        headline = blog_data.get('headline', 'Industry Insights')
+        key_takeaways = blog_data.get('key_takeaways', [])
+        article_content = blog_data.get('article_content', '')
+        
+        # Extract the opening of the article for context
+        content_preview = _content_preview(article_content)
+        takeaways_str = "\n".join("• " + takeaway for takeaway in key_takeaways[:3])
+        
+        blog = _BLOG_PREVIEW_TEMPLATE.format(
+            headline=headline,
+            content_preview=content_preview,
+            takeaways_str=takeaways_str
+        )
+        prompt = _render_linkedin_prompt(num_posts, post_style).replace(_BLOG_MARKER, blog)
+        
+        context = {
+            "headline": headline,
+            "takeaways_str": takeaways_str
+        }
+        return prompt, context
+    
+    def _ensure_linkedin_posts(self, result, headline, takeaways_str):
+        """Fill in a default post if the LinkedIn response came back empty"""
+        if not result.get('linkedin_posts'):
+            post_content = f"🚀 Just published: {headline}\n\n{takeaways_str}\n\nWhat are your thoughts?"
+            result['linkedin_posts'] = [LinkedInPost(
+                post_content=post_content,
+                character_count=len(post_content),
+                hashtags=["#contentmarketing", "#business"],
+                post_type="promotional",
+                engagement_prediction="medium",
+                call_to_action="Share your thoughts below",
+                posting_tip="Post during business hours for better reach"
+            ).model_dump()]
+        return result
+    
+    def _linkedin_error(self, error):
+        """Build the error payload returned when LinkedIn generation fails"""
+        return {
+            "linkedin_posts": [LinkedInPost(
+                post_content=f"Error generating LinkedIn content: {str(error)}",
+                character_count=0,
+                hashtags=["#error"],
+                post_type="error",
+                engagement_prediction="none",
+                call_to_action="Please try again",
+                posting_tip="Check API configuration"
+            ).model_dump()],
+            "content_themes": ["error"],
+            "overall_strategy": "Fix configuration and retry",
+            "error": str(error)
+        }
     
     def generate_twitter_posts(self, blog_data, num_posts=5, include_threads=True):
         """
@@ -165,151 +362,260 @@ class SocialPostAgent:
             dict: Generated Twitter posts with metadata
         """
         try:
-            headline = blog_data.get('headline', 'Industry Insights')
-            key_takeaways = blog_data.get('key_takeaways', [])
-            
-            prompt = f"""
-            Create {num_posts} engaging Twitter/X posts based on this blog:
-            
-            Blog headline: {headline}
-            Key takeaways: {', '.join(key_takeaways[:5])}
-            Include threads: {include_threads}
+            prompt, context = self._build_twitter_prompt(blog_data, num_posts, include_threads)
+            result = self._complete(prompt, TwitterBatch, _TWITTER_SYSTEM_PROMPT)
+            return self._ensure_twitter_posts(result, **context)
+        except Exception as e:
+            return self._twitter_error(e)
+    
+    async def agenerate_twitter_posts(self, blog_data, num_posts=5, include_threads=True):
+        """Async variant of generate_twitter_posts"""
+        try:
+            prompt, context = self._build_twitter_prompt(blog_data, num_posts, include_threads)
+            result = await self._acomplete(prompt, TwitterBatch, _TWITTER_SYSTEM_PROMPT)
+            return self._ensure_twitter_posts(result, **context)
+        except Exception as e:
+            return self._twitter_error(e)
+    
+    def _build_twitter_prompt(self, blog_data, num_posts, include_threads):
+        """Build the Twitter prompt and the context needed to complete its response"""
+        headline = blog_data.get('headline', 'Industry Insights')
+        key_takeaways = blog_data.get('key_takeaways', [])
+        
+        blog = _BLOG_TAKEAWAYS_TEMPLATE.format(headline=headline, takeaways=", ".join(key_takeaways[:5]))
+        prompt = _render_twitter_prompt(num_posts, include_threads).replace(_BLOG_MARKER, blog)
+        
+        context = {
+            "headline": headline
+        }
+        return prompt, context
+    
+    def _ensure_twitter_posts(self, result, headline):
+        """Fill in a default tweet if the Twitter response came back empty"""
+        if not result.get('twitter_posts'):
+            tweet_content = f"🧵 New post: {headline[:100]}... \n\nKey insights inside 👇\n\n#contentmarketing #business"
+            result['twitter_posts'] = [TwitterPost(
+                tweet_content=tweet_content,
+                character_count=len(tweet_content),
+                post_type="single_tweet",
+                hashtags=["#contentmarketing", "#business"],
+                engagement_elements=["emoji", "call_to_action"],
+                thread_position=None,
+                retweet_potential="medium"
+            ).model_dump()]
+        return result
+    
+    def _twitter_error(self, error):
+        """Build the error payload returned when Twitter generation fails"""
+        return {
+            "twitter_posts": [TwitterPost(
+                tweet_content=f"Error generating Twitter content: {str(error)[:200]}",
+                character_count=0,
+                post_type="error",
+                hashtags=["#error"],
+                engagement_elements=[],
+                thread_position=None,
+                retweet_potential="none"
+            ).model_dump()],
+            "thread_posts": [],
+            "posting_strategy": "Fix configuration and retry",
+            "error": str(error)
+        }
+    
+    def generate_cross_platform_campaign(self, blog_data):
+        """
+        Generate a coordinated social media campaign across platforms
+        
+        Args:
+            blog_data (dict): Blog article data
             
-            Create a mix of:
-            1. Single tweets (under 280 characters)
-            2. Quote tweets with compelling statistics/insights
-            3. Question tweets to drive engagement
-            {'4. Thread starter (if include_threads is True)' if include_threads else ''}
+        Returns:
+            dict: Complete cross-platform campaign
+        """
+        return run_sync(self.agenerate_cross_platform_campaign(blog_data))
+    
+    async def agenerate_cross_platform_campaign(self, blog_data):
+        """Async variant of generate_cross_platform_campaign; the platform posts are generated concurrently"""
+        try:
+            linkedin_posts, twitter_posts = await asyncio.gather(
+                self.agenerate_linkedin_posts(blog_data, num_posts=2),
+                self.agenerate_twitter_posts(blog_data, num_posts=3)
+            )
+            return self._build_campaign(blog_data, linkedin_posts, twitter_posts)
+        except Exception as e:
+            return self._campaign_error(e)
+    
+    def generate_all_social_posts(self, blog_data, num_linkedin=2, num_twitter=3):
+        """
+        Generate the LinkedIn and Twitter posts for a blog with one request for both platforms
+        
+        The shared blog context is sent once and both platforms' posts come back in a single
+        structured response. Falls back to the per-platform requests if the model refuses or
+        the response fails validation.
+        
+        Args:
+            blog_data (dict): Blog article data
+            num_linkedin (int): Number of LinkedIn posts to generate
+            num_twitter (int): Number of Twitter posts to generate
             
-            Twitter/X best practices:
-            - Keep single tweets under 280 characters
-            - Use relevant hashtags (2-3 max)
-            - Include engaging hooks
-            - Use emojis strategically
-            - Create conversation starters
-            - Mix promotional with value-driven content
+        Returns:
+            dict: LinkedIn posts under "linkedin_posts" and Twitter posts under "twitter_posts",
+                in the shapes returned by generate_linkedin_posts and generate_twitter_posts
+        """
+        try:
+            prompt, context = self._build_campaign_prompt(blog_data, num_linkedin, num_twitter)
             
-            Return response in JSON format:
-            {{
-                "twitter_posts": [
-                    {{
-                        "tweet_content": "Tweet text with hashtags",
-                        "character_count": 156,
-                        "post_type": "single_tweet",
-                        "hashtags": ["#hashtag1", "#hashtag2"],
-                        "engagement_elements": ["question", "emoji", "statistic"],
-                        "thread_position": null,
-                        "retweet_potential": "high"
-                    }}
-                ],
-                "thread_posts": [
-                    {{
-                        "thread_content": ["Tweet 1/n", "Tweet 2/n", "Tweet 3/n"],
-                        "thread_topic": "Main thread theme",
-                        "total_tweets": 3
-                    }}
-                ],
-                "posting_strategy": "Strategy notes for optimal timing and sequence"
-            }}
-            """
+            try:
+                result = self._complete(prompt, SocialCampaign, _CAMPAIGN_SYSTEM_PROMPT)
+            except StructuredOutputError:
+                return run_sync(self._agenerate_platform_posts(blog_data, num_linkedin, num_twitter))
             
-            response = self.llm.invoke(prompt)
+            return self._split_campaign(result, **context)
             
-            try:
-                result = json.loads(response.content)
-                
-                # Ensure minimum content if parsing succeeds but content is missing
-                if not result.get('twitter_posts'):
-                    result['twitter_posts'] = [{
-                        "tweet_content": f"🧵 New post: {headline[:100]}... \n\nKey insights inside 👇\n\n#contentmarketing #business",
-                        "character_count": 120,
-                        "post_type": "single_tweet",
-                        "hashtags": ["#contentmarketing", "#business"],
-                        "engagement_elements": ["emoji", "call_to_action"],
-                        "thread_position": None,
-                        "retweet_potential": "medium"
-                    }]
-                
-                return result
-                
-            except json.JSONDecodeError:
-                # Fallback with basic tweets
-                fallback_tweets = []
-                for i, takeaway in enumerate(key_takeaways[:3]):
-                    tweet = f"💡 {takeaway[:200]}{'...' if len(takeaway) > 200 else ''}\n\n#insights #business"
-                    fallback_tweets.append({
-                        "tweet_content": tweet,
-                        "character_count": len(tweet),
-                        "post_type": "single_tweet",
-                        "hashtags": ["#insights", "#business"],
-                        "engagement_elements": ["emoji"],
-                        "thread_position": None,
-                        "retweet_potential": "medium"
-                    })
-                
-                return {
-                    "twitter_posts": fallback_tweets,
-                    "thread_posts": [],
-                    "posting_strategy": "Manual review recommended - parsing issue occurred",
-                    "parsing_note": "Fallback content generated"
-                }
-                
         except Exception as e:
             return {
-                "twitter_posts": [{
-                    "tweet_content": f"Error generating Twitter content: {str(e)[:200]}",
-                    "character_count": 0,
-                    "post_type": "error",
-                    "hashtags": ["#error"],
-                    "engagement_elements": [],
-                    "thread_position": None,
-                    "retweet_potential": "none"
-                }],
-                "thread_posts": [],
-                "posting_strategy": "Fix configuration and retry",
+                "linkedin_posts": self._linkedin_error(e),
+                "twitter_posts": self._twitter_error(e),
                 "error": str(e)
             }
     
-    def generate_cross_platform_campaign(self, blog_data):
+    async def _agenerate_platform_posts(self, blog_data, num_linkedin, num_twitter):
+        """Generate the LinkedIn and Twitter posts with concurrent per-platform requests"""
+        linkedin_posts, twitter_posts = await asyncio.gather(
+            self.agenerate_linkedin_posts(blog_data, num_posts=num_linkedin),
+            self.agenerate_twitter_posts(blog_data, num_posts=num_twitter)
+        )
+        posts = {"linkedin_posts": linkedin_posts, "twitter_posts": twitter_posts}
+        errors = [platform_posts['error'] for platform_posts in posts.values() if 'error' in platform_posts]
+        if errors:
+            posts["error"] = "; ".join(errors)
+        return posts
+    
+    def generate_campaign_single_call(self, blog_data, num_linkedin=2, num_twitter=3):
         """
-        Generate a coordinated social media campaign across platforms
+        Generate a cross-platform campaign with one request for both platforms
         
         Args:
             blog_data (dict): Blog article data
+            num_linkedin (int): Number of LinkedIn posts to generate
+            num_twitter (int): Number of Twitter posts to generate
             
         Returns:
             dict: Complete cross-platform campaign
         """
-        try:
-            linkedin_posts = self.generate_linkedin_posts(blog_data, num_posts=2)
-            twitter_posts = self.generate_twitter_posts(blog_data, num_posts=3)
-            
-            campaign = {
-                "campaign_theme": blog_data.get('headline', 'Content Marketing Campaign'),
-                "linkedin_content": linkedin_posts,
-                "twitter_content": twitter_posts,
-                "cross_promotion_strategy": {
-                    "sequence": "Start with LinkedIn thought leadership, follow with Twitter engagement",
-                    "timing": "LinkedIn during business hours, Twitter in evening",
-                    "content_adaptation": "Professional tone for LinkedIn, conversational for Twitter",
-                    "hashtag_strategy": "Platform-specific hashtags with some overlap for brand consistency"
-                },
-                "campaign_duration": "1 week",
-                "success_metrics": [
-                    "Engagement rate by platform",
-                    "Click-through rate to blog",
-                    "Share/retweet count",
-                    "Comment quality and responses"
-                ]
-            }
+        posts = self.generate_all_social_posts(blog_data, num_linkedin, num_twitter)
+        if 'error' in posts:
+            return self._campaign_error(posts['error'])
+        return self._build_campaign(blog_data, posts['linkedin_posts'], posts['twitter_posts'])
+    
+    def generate_campaigns_bulk(self, blog_datas, num_linkedin=2, num_twitter=3, poll_interval=30):
+        """
+        Generate cross-platform campaigns for many blogs through the OpenAI Batch API
+        
+        Batch requests cost half as much and have separate rate limits, but can take up to
+        24 hours, so this is meant for offline runs (e.g. nightly campaign generation).
+        
+        Args:
+            blog_datas (list): Blog article data dicts
+            num_linkedin (int): Number of LinkedIn posts per campaign
+            num_twitter (int): Number of Twitter posts per campaign
+            poll_interval (int): Seconds between batch status checks
             
-            return campaign
+        Returns:
+            list: Campaigns in the same order as blog_datas
+        """
+        try:
+            bodies = {}
+            contexts = {}
+            for index, blog_data in enumerate(blog_datas):
+                custom_id = f"campaign-{index}"
+                prompt, contexts[custom_id] = self._build_campaign_prompt(blog_data, num_linkedin, num_twitter)
+                bodies[custom_id] = {
+                    "model": self.model,
+                    "temperature": self.temperature,
+                    "response_format": response_format_for(SocialCampaign),
+                    "messages": build_messages(prompt, system=_CAMPAIGN_SYSTEM_PROMPT)
+                }
             
+            contents = run_chat_batch(bodies, poll_interval=poll_interval)
         except Exception as e:
-            return {
-                "campaign_theme": "Campaign Generation Error",
-                "linkedin_content": {"error": str(e)},
-                "twitter_content": {"error": str(e)},
-                "cross_promotion_strategy": {"note": "Manual campaign planning required"},
-                "error": str(e)
-            }
+            return [self._campaign_error(e) for _ in blog_datas]
+        
+        campaigns = []
+        for (custom_id, content), blog_data in zip(contents.items(), blog_datas):
+            try:
+                if content is None:
+                    raise RuntimeError("Batch request failed")
+                result = parse_structured(content, SocialCampaign)
+                posts = self._split_campaign(result, **contexts[custom_id])
+                campaigns.append(self._build_campaign(blog_data, posts['linkedin_posts'], posts['twitter_posts']))
+            except Exception as e:
+                campaigns.append(self._campaign_error(e))
+        return campaigns
+    
+    def _build_campaign_prompt(self, blog_data, num_linkedin, num_twitter):
+        """Build the combined LinkedIn and Twitter prompt and the context needed to complete its response"""
+        headline = blog_data.get('headline', 'Industry Insights')
+        key_takeaways = blog_data.get('key_takeaways', [])
+        article_content = blog_data.get('article_content', '')
+        
+        content_preview = _content_preview(article_content)
+        takeaways_str = "\n".join("• " + takeaway for takeaway in key_takeaways[:5])
+        
+        blog = _BLOG_PREVIEW_TEMPLATE.format(
+            headline=headline,
+            content_preview=content_preview,
+            takeaways_str=takeaways_str
+        )
+        prompt = _render_campaign_prompt(num_linkedin, num_twitter).replace(_BLOG_MARKER, blog)
+        
+        context = {
+            "headline": headline,
+            "takeaways_str": takeaways_str
+        }
+        return prompt, context
+    
+    def _split_campaign(self, result, headline, takeaways_str):
+        """Split a combined SocialCampaign response into per-platform posts"""
+        linkedin_posts = self._ensure_linkedin_posts({
+            "linkedin_posts": result.get('linkedin_posts', []),
+            "content_themes": result.get('content_themes', []),
+            "overall_strategy": result.get('overall_strategy', '')
+        }, headline, takeaways_str)
+        twitter_posts = self._ensure_twitter_posts({
+            "twitter_posts": result.get('twitter_posts', []),
+            "thread_posts": result.get('thread_posts', []),
+            "posting_strategy": result.get('posting_strategy', '')
+        }, headline)
+        return {"linkedin_posts": linkedin_posts, "twitter_posts": twitter_posts}
+    
+    def _build_campaign(self, blog_data, linkedin_posts, twitter_posts):
+        """Assemble the cross-platform campaign from the generated posts"""
+        return {
+            "campaign_theme": blog_data.get('headline', 'Content Marketing Campaign'),
+            "linkedin_content": linkedin_posts,
+            "twitter_content": twitter_posts,
+            "cross_promotion_strategy": {
+                "sequence": "Start with LinkedIn thought leadership, follow with Twitter engagement",
+                "timing": "LinkedIn during business hours, Twitter in evening",
+                "content_adaptation": "Professional tone for LinkedIn, conversational for Twitter",
+                "hashtag_strategy": "Platform-specific hashtags with some overlap for brand consistency"
+            },
+            "campaign_duration": "1 week",
+            "success_metrics": [
+                "Engagement rate by platform",
+                "Click-through rate to blog",
+                "Share/retweet count",
+                "Comment quality and responses"
+            ]
+        }
+    
+    def _campaign_error(self, error):
+        """Build the error payload returned when campaign generation fails"""
+        return {
+            "campaign_theme": "Campaign Generation Error",
+            "linkedin_content": {"error": str(error)},
+            "twitter_content": {"error": str(error)},
+            "cross_promotion_strategy": {"note": "Manual campaign planning required"},
+            "error": str(error)
+        }
@@ -3,41 +3,100 @@ Topic Research Agent for Content Marketing Pipeline
 Researches trending topics based on seed keywords using OpenAI GPT-4o
 """
 
-import os
-import json
-from crewai import Agent
-from langchain_openai import ChatOpenAI
+import functools
+from utils.chat_models import get_llm
+from agents.schemas import TopicsBatch, CompetitionAnalysis
+from utils.openai_client import complete_structured, CACHE_ENABLED
+
+
+__all__ = ["TopicResearchAgent", "TRENDING_CACHE_TTL"]
+
+# Trending topics go stale quickly, so cached research expires after a week
+TRENDING_CACHE_TTL = 7 * 24 * 60 * 60
+
+_TOPIC_BACKSTORY = """You are an expert content strategist with deep knowledge of market trends, 
+            consumer behavior, and digital marketing. You have years of experience identifying viral 
+            content opportunities and understanding what resonates with different audiences across 
+            various industries. Your research is always data-driven and focuses on topics that 
+            balance trending appeal with evergreen value."""
+
+_TOPICS_SYSTEM_PROMPT = f"""{_TOPIC_BACKSTORY}
+
+Research and suggest 3-5 trending content topics that would be valuable for content marketing,
+based on the seed keywords and industry context provided by the user.
+
+For each topic, provide:
+1. Topic title
+2. Why it's trending
+3. Target audience appeal
+4. Content angle suggestions
+5. SEO potential score (1-10)
+"""
+
+_COMPETITION_SYSTEM_PROMPT = f"""{_TOPIC_BACKSTORY}
+
+Analyze the competition level for the content topic provided by the user.
+
+Provide analysis on:
+1. Competition level (low/medium/high)
+2. Content gap opportunities
+3. Differentiation strategies
+4. Optimal content format recommendations
+"""
+
+# Per-call user prompts, filled with str.format; the seed keywords vary most, so they go last
+_TOPICS_PROMPT_TEMPLATE = """Industry context: {industry_context}
+Seed keywords: {keywords_str}
+"""
+
+_COMPETITION_PROMPT_TEMPLATE = """Topic: "{topic}"
+Related keywords: {keywords_str}
+"""
 
 
 class TopicResearchAgent:
     """Agent responsible for researching trending topics in a given industry"""
     
-    def __init__(self):
+    def __init__(self, cache=None, cache_ttl=TRENDING_CACHE_TTL, use_memory=False):
         # the newest OpenAI model is "gpt-4o" which was released May 13, 2024.
         # do not change this unless explicitly requested by the user
-        self.llm = ChatOpenAI(
-            model="gpt-4o",
-            api_key=os.getenv("OPENAI_API_KEY"),
-            temperature=0.7
-        )
+        self.model = "gpt-4o"
+        self.temperature = 0.7
+        # Competition analysis is an assessment rather than ideation, so sample it deterministically
+        self.analysis_temperature = 0
+        # Cache LLM responses on disk, reusing them for up to cache_ttl seconds (None: no expiry).
+        # By default trending research is cached when CACHE_ENABLED is set, since the TTL keeps it
+        # fresh, and competition analysis follows the deterministic-calls-only default
+        self.cache = cache
+        self.cache_ttl = cache_ttl
+        # Generation calls are stateless one-shots; CrewAI memory only adds embedding round trips
+        self.use_memory = use_memory
+    
+    @functools.cached_property
+    def llm(self):
+        """LangChain chat model for the CrewAI agent, created on first use"""
+        return get_llm(self.model, self.temperature)
     
     def create_agent(self):
         """Create and return the topic research agent"""
+        from crewai import Agent
+        
         return Agent(
             role="Content Topic Research Specialist",
             goal="Research and identify trending topics in specified industries that will drive engagement and provide value to target audiences",
-            backstory="""You are an expert content strategist with deep knowledge of market trends, 
-            consumer behavior, and digital marketing. You have years of experience identifying viral 
-            content opportunities and understanding what resonates with different audiences across 
-            various industries. Your research is always data-driven and focuses on topics that 
-            balance trending appeal with evergreen value.""",
+            backstory=_TOPIC_BACKSTORY,
             verbose=True,
             allow_delegation=False,
             llm=self.llm,
-            max_iter=3,
-            memory=True
+            max_iter=1,
+            memory=self.use_memory
         )
     
+    def _complete(self, prompt, schema, system, temperature, cache):
+        """Run a structured completion with the agent's model and cache TTL"""
+        return complete_structured(prompt, schema, model=self.model, temperature=temperature, system=system,
+                                   cache=cache, cache_ttl=self.cache_ttl)
+    
     def research_topics(self, seed_keywords, industry_context=""):
         """
         Research trending topics based on seed keywords
@@ -52,90 +111,11 @@ class TopicResearchAgent:
         try:
             keywords_str = ", ".join(seed_keywords)
             
-            prompt = f"""
-            Based on the seed keywords: {keywords_str}
-            Industry context: {industry_context}
-            
-            Research and suggest 3-5 trending content topics that would be valuable for content marketing.
-            
-            For each topic, provide:
-            1. Topic title
-            2. Why it's trending
-            3. Target audience appeal
-            4. Content angle suggestions
-            5. SEO potential score (1-10)
+            prompt = _TOPICS_PROMPT_TEMPLATE.format(keywords_str=keywords_str, industry_context=industry_context)
             
-            Return your response in JSON format with this structure:
-            {{
-                "trending_topics": [
-                    {{
-                        "title": "Topic Title",
-                        "trending_reason": "Why this topic is trending",
-                        "target_audience": "Who would be interested",
-                        "content_angles": ["angle1", "angle2", "angle3"],
-                        "seo_score": 8,
-                        "urgency_level": "high/medium/low"
-                    }}
-                ],
-                "market_insights": "Overall market observations",
-                "recommended_focus": "Which topic to prioritize and why"
-            }}
-            """
+            cache = CACHE_ENABLED if self.cache is None else self.cache
+            return self._complete(prompt, TopicsBatch, _TOPICS_SYSTEM_PROMPT, self.temperature, cache)
             
-            response = self.llm.invoke(prompt)
-            
-            # Parse the JSON response
-            try:
-                content = response.content
-                # Handle if response.content is a string
-                if isinstance(content, str):
-                    # Try to extract JSON from the response if it's wrapped in text
-                    if "```json" in content:
-                        start = content.find("```json") + 7
-                        end = content.find("```", start)
-                        content = content[start:end].strip()
-                    elif "```" in content:
-                        start = content.find("```") + 3
-                        end = content.find("```", start)
-                        content = content[start:end].strip()
-                
-                result = json.loads(content)
-                return result
-            except json.JSONDecodeError:
-                # Enhanced fallback - try to extract useful information
-                try:
-                    # Look for key information in the response text
-                    content = response.content
-                    if "AI in Driving Digital Transformation" in content:
-                        return {
-                            "trending_topics": [{
-                                "title": "The Role of AI in Driving Digital Transformation",
-                                "trending_reason": "Businesses are increasingly using AI to accelerate their digital transformation efforts",
-                                "target_audience": "Business leaders, IT professionals, digital transformation strategists",
-                                "content_angles": ["AI implementation strategies", "Digital transformation best practices", "ROI of AI in business"],
-                                "seo_score": 9,
-                                "urgency_level": "high"
-                            }],
-                            "market_insights": "High interest in AI-driven business transformation and automation",
-                            "recommended_focus": "Focus on AI in Digital Transformation due to high market demand"
-                        }
-                except:
-                    pass
-                
-                # Final fallback
-                return {
-                    "trending_topics": [{
-                        "title": "AI and Digital Transformation in Modern Business",
-                        "trending_reason": "Growing adoption of AI technologies in business operations",
-                        "target_audience": "Business professionals and decision makers",
-                        "content_angles": ["AI implementation", "Business automation", "Digital strategy"],
-                        "seo_score": 8,
-                        "urgency_level": "high"
-                    }],
-                    "market_insights": "Strong market interest in AI and automation solutions",
-                    "recommended_focus": "AI and digital transformation topics show high engagement potential"
-                }
-                
         except Exception as e:
             return {
                 "trending_topics": [],
@@ -158,40 +138,11 @@ class TopicResearchAgent:
         try:
             keywords_str = ", ".join(keywords)
             
-            prompt = f"""
-            Analyze the competition level for this content topic: "{topic}"
-            Related keywords: {keywords_str}
-            
-            Provide analysis on:
-            1. Competition level (low/medium/high)
-            2. Content gap opportunities
-            3. Differentiation strategies
-            4. Optimal content format recommendations
-            
-            Return response in JSON format:
-            {{
-                "competition_level": "medium",
-                "content_gaps": ["gap1", "gap2"],
-                "differentiation_strategies": ["strategy1", "strategy2"],
-                "recommended_formats": ["blog", "video", "infographic"],
-                "success_probability": 7
-            }}
-            """
+            prompt = _COMPETITION_PROMPT_TEMPLATE.format(topic=topic, keywords_str=keywords_str)
             
-            response = self.llm.invoke(prompt)
+            return self._complete(prompt, CompetitionAnalysis, _COMPETITION_SYSTEM_PROMPT, self.analysis_temperature,
+                                  self.cache)
             
-            try:
-                return json.loads(response.content)
-            except json.JSONDecodeError:
-                return {
-                    "competition_level": "unknown",
-                    "content_gaps": [],
-                    "differentiation_strategies": [],
-                    "recommended_formats": ["blog"],
-                    "success_probability": 5,
-                    "raw_analysis": response.content
-                }
-                
         except Exception as e:
             return {
                 "competition_level": "unknown",
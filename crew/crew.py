@@ -4,42 +4,113 @@ Orchestrates all agents and tasks in the content marketing workflow
 """
 
 import os
-import json
+import csv
+import copy
+import asyncio
+import logging
+import threading
+import functools
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime
-from crewai import Crew, Process
-from agents.topic_research_agent import TopicResearchAgent
+from pathlib import Path
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from agents.topic_research_agent import TopicResearchAgent, TRENDING_CACHE_TTL
 from agents.blog_writer_agent import BlogWriterAgent
 from agents.social_post_agent import SocialPostAgent
 from agents.scheduler_agent import SchedulerAgent
-from tasks.task import ContentMarketingTasks
+from utils.dag import run_dag
+from utils.llm_cache import LLMCache, request_key
+from utils.openai_client import CACHE_ENABLED, LLM_CACHE_DIR, run_sync
+from utils.jsonutil import loads, dumps, write_json
+from utils.output import ensure_output_dir
+
+
+logger = logging.getLogger("pipeline")
+
+# Posts generated per platform for each campaign
+LINKEDIN_POSTS = 2
+TWITTER_POSTS = 3
+
+# Accepted pipeline inputs
+WORD_COUNT_RANGE = range(300, 601)
+BRAND_VOICES = ('professional', 'casual', 'authoritative', 'friendly', 'technical')
+
+# Pipeline steps whose failure stops the campaign, in pipeline order: (node_id, error, console message)
+_STEP_FAILURES = (
+    ("research", "Topic research failed", "Topic research failed. Check your API configuration."),
+    ("blog", "Blog writing failed", "Blog writing failed."),
+    ("social", "Social media creation failed", "Social media creation failed."),
+    ("schedule", "Scheduling failed", "Scheduling failed.")
+)
+
+
+# Stage cache policy: (maximum age in seconds of a reusable result or None for no expiry, whether the
+# stage is cached by default). Only topic research is cached by default, bounded by its TTL; the blog,
+# social and schedule outputs are sampled, so like other sampled LLM output they are only cached
+# when the crew is created with cache=True
+_STAGE_CACHE_POLICY = {
+    "research": (TRENDING_CACHE_TTL, True),
+    "blog": (None, False),
+    "social": (None, False),
+    "schedule": (None, False)
+}
+
+
+def _step_failed(results):
+    """Return True if a pipeline step produced no results or an error result"""
+    return not results or 'error' in results
 
 
 class ContentMarketingCrew:
     """Main crew orchestrator for the content marketing pipeline"""
     
-    def __init__(self):
-        # Initialize all agents
-        self.topic_research_agent = TopicResearchAgent()
-        self.blog_writer_agent = BlogWriterAgent()
-        self.social_post_agent = SocialPostAgent()
-        self.scheduler_agent = SchedulerAgent()
-        
-        # Initialize task manager
-        self.task_manager = ContentMarketingTasks()
-        
-        # Create agent instances
-        self.agents = {
-            'researcher': self.topic_research_agent.create_agent(),
-            'writer': self.blog_writer_agent.create_agent(),
-            'social_manager': self.social_post_agent.create_agent(),
-            'scheduler': self.scheduler_agent.create_agent()
-        }
+    def __init__(self, cache=None):
+        # Reuse stage results for identical inputs across runs. None follows CACHE_ENABLED and only
+        # caches topic research; True also caches the sampled blog, social and schedule stages
+        self.cache = CACHE_ENABLED if cache is None else cache
+        self.cache_sampled = cache is True
+        self.stage_cache = LLMCache(os.path.join(LLM_CACHE_DIR, "stages.sqlite"))
+        self.cache_stats = {"hits": 0, "misses": 0}
+        self._stats_lock = threading.Lock()
+        
+        # Timestamp shared by every output file of a run
+        self.run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        
+        # JSON artifacts are written in the background while the next stage runs
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
+        self._pending_writes = []
         
         # Ensure output directory exists
-        os.makedirs('output', exist_ok=True)
+        ensure_output_dir()
+    
+    # Agents and the task manager are built on first use and reused by every run of this crew
+    
+    @functools.cached_property
+    def topic_research_agent(self):
+        return TopicResearchAgent()
+    
+    @functools.cached_property
+    def blog_writer_agent(self):
+        return BlogWriterAgent()
+    
+    @functools.cached_property
+    def social_post_agent(self):
+        return SocialPostAgent()
+    
+    @functools.cached_property
+    def scheduler_agent(self):
+        return SchedulerAgent()
+    
+    @functools.cached_property
+    def task_manager(self):
+        # Deferred: the task definitions import CrewAI, which the direct agent calls don't need
+        from tasks.task import ContentMarketingTasks, PromptProgramCache
+        # Task outputs use the current run_id; each run_complete_pipeline call starts a new task run
+        return ContentMarketingTasks(program_cache=PromptProgramCache() if self.cache_sampled else None,
+                                    run_ts=self.run_id)
     
     def run_complete_pipeline(self, seed_keywords, industry_context="", target_audience="B2B professionals", 
-                            word_count=500, brand_voice="professional", timezone="UTC"):
+                            word_count=500, brand_voice="professional", timezone="UTC", run_id=None):
         """
         Run the complete content marketing pipeline
         
@@ -49,96 +120,202 @@ class ContentMarketingCrew:
             target_audience (str): Target audience description
             word_count (int): Target blog word count (300-600)
             brand_voice (str): Brand voice style
-            timezone (str): Target timezone for scheduling
+            timezone (str): IANA timezone name for scheduling (e.g. "America/New_York")
+            run_id (str): Output file timestamp for this run (default: the current time)
             
         Returns:
             dict: Complete pipeline results
+            
+        Raises:
+            ValueError: If an input is invalid; raised before any LLM request is made
         """
+        # Convert seed_keywords to list if string
+        if isinstance(seed_keywords, str):
+            seed_keywords = [kw.strip() for kw in seed_keywords.split(',')]
+        
+        self._validate_inputs(seed_keywords, word_count, brand_voice, timezone)
+        
         try:
-            print("🚀 Starting Content Marketing Pipeline...")
-            
-            # Convert seed_keywords to list if string
-            if isinstance(seed_keywords, str):
-                seed_keywords = [kw.strip() for kw in seed_keywords.split(',')]
-            
-            # Step 1: Topic Research
-            print("📊 Step 1: Researching trending topics...")
-            topic_results = self._run_topic_research(seed_keywords, industry_context)
-            
-            if not topic_results or 'error' in topic_results:
-                print("❌ Topic research failed. Check your API configuration.")
-                return {"error": "Topic research failed", "details": topic_results}
-            
-            # Step 2: Blog Writing
-            print("✍️ Step 2: Writing blog article...")
-            blog_results = self._run_blog_writing(topic_results, word_count, brand_voice)
-            
-            if not blog_results or 'error' in blog_results:
-                print("❌ Blog writing failed.")
-                return {"error": "Blog writing failed", "details": blog_results}
-            
-            # Step 3: Social Media Posts
-            print("📱 Step 3: Creating social media posts...")
-            social_results = self._run_social_media_creation(blog_results)
-            
-            if not social_results or 'error' in social_results:
-                print("❌ Social media creation failed.")
-                return {"error": "Social media creation failed", "details": social_results}
-            
-            # Step 4: Scheduling
-            print("📅 Step 4: Creating posting schedule...")
-            
-            # Combine all content for scheduling
-            complete_content = {
-                **blog_results,
-                'linkedin_content': social_results.get('linkedin_posts', {}),
-                'twitter_content': social_results.get('twitter_posts', {})
-            }
-            
-            schedule_results = self._run_scheduling(complete_content, target_audience, timezone)
-            
-            if not schedule_results or 'error' in schedule_results:
-                print("❌ Scheduling failed.")
-                return {"error": "Scheduling failed", "details": schedule_results}
+            logger.info("🚀 Starting Content Marketing Pipeline...")
+            self.run_id = run_id or datetime.now().strftime('%Y%m%d_%H%M%S')
+            self.cache_stats = {"hits": 0, "misses": 0}
+            # Task outputs of this run are written under the run's own timestamp
+            if 'task_manager' in self.__dict__:
+                self.task_manager.new_run(self.run_id)
+            
+            # Research and the blog run in order; once the blog is ready the social posts and
+            # schedule are generated concurrently
+            results = run_sync(run_dag(self._pipeline_nodes(
+                seed_keywords, industry_context, target_audience, word_count, brand_voice, timezone
+            ), failed=_step_failed))
+            
+            for node_id, failure, message in _STEP_FAILURES:
+                step_results = results.get(node_id)
+                if _step_failed(step_results):
+                    logger.error(f"❌ {message}")
+                    self._flush_writes()
+                    return {"error": failure, "details": step_results}
+            
+            topic_results = results['research']
+            blog_results = results['blog']
+            social_results = results['social']
+            schedule_results = results['schedule']
             
             # Step 5: Compile final results
-            print("📋 Step 5: Compiling final campaign...")
+            logger.info("📋 Step 5: Compiling final campaign...")
             final_campaign = self._compile_final_campaign(
                 topic_results, blog_results, social_results, schedule_results
             )
             
             # Save complete campaign
             self._save_campaign_files(final_campaign)
+            self._flush_writes()
             
-            print("✅ Content Marketing Pipeline completed successfully!")
-            print(f"📁 Results saved to output/ directory")
+            logger.info("✅ Content Marketing Pipeline completed successfully!")
+            logger.info(f"📁 Results saved to output/ directory")
+            if self.cache:
+                logger.info(f"🗄️ Stage cache: {self.cache_stats['hits']} hits, {self.cache_stats['misses']} misses")
             
             return final_campaign
             
         except Exception as e:
             error_msg = f"Pipeline execution failed: {str(e)}"
-            print(f"❌ {error_msg}")
+            logger.error(f"❌ {error_msg}")
             return {"error": error_msg, "timestamp": datetime.now().isoformat()}
     
+    def _validate_inputs(self, seed_keywords, word_count, brand_voice, timezone):
+        """
+        Check the pipeline inputs up front so bad input fails before the first LLM request
+        
+        Args:
+            seed_keywords (list): Seed keywords for topic research
+            word_count (int): Target blog word count
+            brand_voice (str): Brand voice style
+            timezone (str): IANA timezone name (e.g. "Europe/Berlin"); abbreviations such as "PST" are rejected
+            
+        Raises:
+            ValueError: Describing the first invalid input
+        """
+        if not any(keyword.strip() for keyword in seed_keywords):
+            raise ValueError("At least one seed keyword is required")
+        
+        if word_count not in WORD_COUNT_RANGE:
+            raise ValueError(f"Word count must be between {WORD_COUNT_RANGE.start} and {WORD_COUNT_RANGE.stop - 1}")
+        
+        if brand_voice not in BRAND_VOICES:
+            raise ValueError(f"Unknown brand voice '{brand_voice}' (expected one of: {', '.join(BRAND_VOICES)})")
+        
+        try:
+            ZoneInfo(timezone)
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValueError(f"Unknown timezone '{timezone}' (expected an IANA name such as 'America/New_York')") from None
+    
+    def kickoff_for_each(self, inputs, max_workers=8):
+        """
+        Run the complete pipeline for many inputs concurrently, reusing this crew's agents
+        
+        Args:
+            inputs (list): run_complete_pipeline keyword arguments, one dict per campaign
+            max_workers (int): Maximum number of pipelines running at once
+            
+        Returns:
+            list: Pipeline results in the same order as inputs; inputs that fail validation (or
+                name an unknown argument) get an error result instead of stopping the batch
+        """
+        # Built once here rather than racing in the worker threads
+        for name in ('topic_research_agent', 'blog_writer_agent', 'social_post_agent', 'scheduler_agent'):
+            getattr(self, name)
+        
+        batch_id = datetime.now().strftime('%Y%m%d_%H%M%S')
+        
+        def kickoff(index, pipeline_inputs):
+            # Each run keeps its own run_id, stats, pending writes and task manager on a shallow copy
+            crew = copy.copy(self)
+            crew._pending_writes = []
+            crew.__dict__.pop('task_manager', None)
+            run_id = f"{batch_id}_{index:03d}"
+            try:
+                return crew.run_complete_pipeline(**{"run_id": run_id, **pipeline_inputs})
+            except (TypeError, ValueError) as e:
+                logger.error(f"❌ Invalid input for run {run_id}: {e}")
+                return {"error": str(e)}
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(kickoff, range(len(inputs)), inputs))
+    
+    def _pipeline_nodes(self, seed_keywords, industry_context, target_audience, word_count, brand_voice, timezone):
+        """Build the (node_id, fn, deps) graph for run_complete_pipeline"""
+        async def research():
+            logger.info("📊 Step 1: Researching trending topics...")
+            return await asyncio.to_thread(self._run_topic_research, seed_keywords, industry_context)
+        
+        async def blog(topic_results):
+            logger.info("✍️ Step 2: Writing blog article...")
+            return await asyncio.to_thread(self._run_blog_writing, topic_results, word_count, brand_voice)
+        
+        async def social(blog_results):
+            logger.info("📱 Step 3: Creating social media posts...")
+            return await asyncio.to_thread(self._run_social_media_creation, blog_results)
+        
+        async def schedule(blog_results):
+            # Only the planned post counts are needed, so scheduling doesn't wait for the posts
+            logger.info("📅 Step 4: Creating posting schedule...")
+            return await asyncio.to_thread(self._run_scheduling, blog_results, target_audience, timezone,
+                                           (LINKEDIN_POSTS, TWITTER_POSTS))
+        
+        return [
+            ("research", research, ()),
+            ("blog", blog, ("research",)),
+            ("social", social, ("blog",)),
+            ("schedule", schedule, ("blog",))
+        ]
+    
+    def _cached(self, step, fn, *args):
+        """
+        Run a pipeline stage through the stage cache
+        
+        Args:
+            step (str): Stage name, part of the cache key; the part before any ":" selects its cache policy
+            fn (callable): Stage function returning a JSON-serializable dict
+            *args: Stage inputs, hashed into the cache key
+            
+        Returns:
+            dict: The cached or freshly computed stage result (error results are never cached)
+        """
+        ttl, by_default = _STAGE_CACHE_POLICY[step.partition(":")[0]]
+        if not self.cache or not (by_default or self.cache_sampled):
+            return fn(*args)
+        
+        key = request_key({"step": step, "args": args})
+        content = self.stage_cache.get(key, ttl)
+        with self._stats_lock:
+            self.cache_stats["hits" if content is not None else "misses"] += 1
+        if content is not None:
+            return loads(content)
+        
+        result = fn(*args)
+        if result and 'error' not in result:
+            self.stage_cache.set(key, dumps(result))
+        return result
+    
     def _run_topic_research(self, seed_keywords, industry_context):
         """Execute topic research phase"""
         try:
             # Use the agent's research method directly for more control
-            results = self.topic_research_agent.research_topics(seed_keywords, industry_context)
+            results = self._cached("research", self.topic_research_agent.research_topics, seed_keywords, industry_context)
             
             # Save results
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            timestamp = self.run_id
             output_file = f"output/topic_research_{timestamp}.json"
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
+            self._write_json(output_file, results)
             
-            print(f"   ✓ Topic research completed. Results saved to {output_file}")
+            logger.info(f"   ✓ Topic research completed. Results saved to {output_file}")
             
             return results
             
         except Exception as e:
-            print(f"   ✗ Topic research error: {str(e)}")
+            logger.error(f"   ✗ Topic research error: {str(e)}")
             return {"error": str(e)}
     
     def _run_blog_writing(self, topic_results, word_count, brand_voice):
@@ -153,42 +330,52 @@ class ContentMarketingCrew:
             top_topic = trending_topics[0]
             
             # Use the agent's writing method directly
-            results = self.blog_writer_agent.write_blog_article(top_topic, word_count, brand_voice)
+            results = self._cached("blog", self._write_blog_article, top_topic, word_count, brand_voice)
             
             # Save results
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            timestamp = self.run_id
             output_file = f"output/blog_article_{timestamp}.json"
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
+            self._write_json(output_file, results)
             
             # Also save as markdown file
             if results.get('article_content'):
                 md_file = f"output/blog_article_{timestamp}.md"
-                with open(md_file, 'w', encoding='utf-8') as f:
-                    f.write(f"# {results.get('headline', 'Blog Article')}\n\n")
-                    f.write(f"*{results.get('meta_description', '')}*\n\n")
-                    f.write(f"{results.get('article_content', '')}\n\n")
-                    f.write(f"**Reading time:** {results.get('reading_time', 'Unknown')}\n\n")
-                    f.write(f"**Tags:** {', '.join(results.get('suggested_tags', []))}\n")
+                self._write_text(md_file, "".join([
+                    f"# {results.get('headline', 'Blog Article')}\n\n",
+                    f"*{results.get('meta_description', '')}*\n\n",
+                    f"{results.get('article_content', '')}\n\n",
+                    f"**Reading time:** {results.get('reading_time', 'Unknown')}\n\n",
+                    f"**Tags:** {', '.join(results.get('suggested_tags', []))}\n"
+                ]))
                 
-                print(f"   ✓ Blog article completed. Results saved to {output_file} and {md_file}")
+                logger.info(f"   ✓ Blog article completed. Results saved to {output_file} and {md_file}")
             
             return results
             
         except Exception as e:
-            print(f"   ✗ Blog writing error: {str(e)}")
+            logger.error(f"   ✗ Blog writing error: {str(e)}")
             return {"error": str(e)}
     
+    def _write_blog_article(self, topic, word_count, brand_voice):
+        return self.blog_writer_agent.write_blog_article(topic, word_count, brand_voice).to_dict()
+    
     def _run_social_media_creation(self, blog_results):
         """Execute social media content creation phase"""
         try:
-            # Generate LinkedIn posts
-            linkedin_results = self.social_post_agent.generate_linkedin_posts(blog_results, num_posts=2)
-            
-            # Generate Twitter posts
-            twitter_results = self.social_post_agent.generate_twitter_posts(blog_results, num_posts=3)
+            # Generate the LinkedIn and Twitter posts with one request; a failed platform
+            # carries its own error payload into the saved results
+            posts = self._cached("social", self.social_post_agent.generate_all_social_posts,
+                                 blog_results, LINKEDIN_POSTS, TWITTER_POSTS)
+            return self._save_social_results(posts['linkedin_posts'], posts['twitter_posts'])
             
+        except Exception as e:
+            logger.error(f"   ✗ Social media creation error: {str(e)}")
+            return {"error": str(e)}
+    
+    def _save_social_results(self, linkedin_results, twitter_results):
+        """Combine and save the generated LinkedIn and Twitter posts"""
+        try:
             # Combine results
             social_results = {
                 "linkedin_posts": linkedin_results,
@@ -202,74 +389,89 @@ class ContentMarketingCrew:
             }
             
             # Save results
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            timestamp = self.run_id
             output_file = f"output/social_posts_{timestamp}.json"
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(social_results, f, indent=2, ensure_ascii=False)
+            self._write_json(output_file, social_results)
             
-            print(f"   ✓ Social media posts completed. Results saved to {output_file}")
+            logger.info(f"   ✓ Social media posts completed. Results saved to {output_file}")
             
             return social_results
             
         except Exception as e:
-            print(f"   ✗ Social media creation error: {str(e)}")
+            logger.error(f"   ✗ Social media creation error: {str(e)}")
             return {"error": str(e)}
     
-    def _run_scheduling(self, content_data, target_audience, timezone):
+    def _run_scheduling(self, content_data, target_audience, timezone, post_counts=None):
         """Execute scheduling phase"""
         try:
             # Use the agent's scheduling method directly
-            results = self.scheduler_agent.generate_posting_schedule(
-                content_data, target_audience, timezone, campaign_duration=7
-            )
+            # Schedules start today, so a cached schedule is only reused on the day it was made
+            step = f"schedule:{datetime.now().strftime('%Y-%m-%d')}"
+            results = self._cached(step, self._generate_schedule, content_data, target_audience, timezone, post_counts)
             
             # Save results
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            timestamp = self.run_id
             output_file = f"output/posting_schedule_{timestamp}.json"
             
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(results, f, indent=2, ensure_ascii=False)
+            self._write_json(output_file, results)
             
             # Save CSV schedule if available
             if results.get('csv_export'):
                 csv_file = f"output/posting_schedule_{timestamp}.csv"
                 self._save_csv_schedule(results['csv_export'], csv_file)
-                print(f"   ✓ Schedule completed. Results saved to {output_file} and {csv_file}")
+                logger.info(f"   ✓ Schedule completed. Results saved to {output_file} and {csv_file}")
             else:
-                print(f"   ✓ Schedule completed. Results saved to {output_file}")
+                logger.info(f"   ✓ Schedule completed. Results saved to {output_file}")
             
             return results
             
         except Exception as e:
-            print(f"   ✗ Scheduling error: {str(e)}")
+            logger.error(f"   ✗ Scheduling error: {str(e)}")
             return {"error": str(e)}
     
+    def _write_json(self, path, obj):
+        """Queue a JSON artifact to be written by the background I/O pool"""
+        self._pending_writes.append(self._io_pool.submit(write_json, path, obj))
+    
+    def _write_text(self, path, text):
+        """Queue a text artifact to be written by the background I/O pool"""
+        self._pending_writes.append(self._io_pool.submit(Path(path).write_text, text, encoding='utf-8'))
+    
+    def _flush_writes(self):
+        """Wait for the queued artifacts to be written, re-raising the first write error"""
+        pending, self._pending_writes = self._pending_writes, []
+        for future in wait(pending).done:
+            future.result()
+    
+    def _generate_schedule(self, content_data, target_audience, timezone, post_counts):
+        return self.scheduler_agent.generate_posting_schedule(
+            content_data, target_audience, timezone, campaign_duration=7, post_counts=post_counts
+        ).to_dict()
+    
     def _save_csv_schedule(self, csv_data, filename):
         """Save schedule data as CSV file"""
         try:
-            import csv
-            
             if not csv_data:
                 return
             
-            # Get field names from first row
-            fieldnames = csv_data[0].keys() if csv_data else []
-            
-            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(csv_data)
+            # First row is the header, the rest are post tuples; a 1 MiB buffer writes
+            # long schedules in a few large chunks
+            with open(filename, 'w', newline='', encoding='utf-8', buffering=1 << 20) as csvfile:
+                csv.writer(csvfile).writerows(csv_data)
                 
-        except Exception as e:
-            print(f"   ⚠️ Warning: Could not save CSV schedule: {str(e)}")
+        except (OSError, csv.Error) as e:
+            logger.warning(f"   ⚠️ Warning: Could not save CSV schedule: {str(e)}")
     
     def _compile_final_campaign(self, topic_results, blog_results, social_results, schedule_results):
         """Compile all results into final campaign package"""
+        linkedin_count = len(social_results.get('linkedin_posts', {}).get('linkedin_posts', []))
+        twitter_count = len(social_results.get('twitter_posts', {}).get('twitter_posts', []))
         
         campaign = {
             "campaign_metadata": {
                 "generated_at": datetime.now().isoformat(),
+                "run_id": self.run_id,
                 "pipeline_version": "1.0.0",
                 "status": "completed"
             },
@@ -278,11 +480,9 @@ class ContentMarketingCrew:
             "social_media": social_results,
             "posting_schedule": schedule_results,
             "campaign_summary": {
-                "total_content_pieces": (
-                    1 +  # blog post
-                    len(social_results.get('linkedin_posts', {}).get('linkedin_posts', [])) +
-                    len(social_results.get('twitter_posts', {}).get('twitter_posts', []))
-                ),
+                "total_content_pieces": 1 + linkedin_count + twitter_count,  # blog post + social posts
+                "total_linkedin_posts": linkedin_count,
+                "total_twitter_posts": twitter_count,
                 "estimated_reach": "Varies by audience size and engagement",
                 "campaign_duration": schedule_results.get('campaign_overview', {}).get('end_date', 'Unknown'),
                 "key_topics": topic_results.get('trending_topics', [])[:3] if topic_results else [],
@@ -294,52 +494,60 @@ class ContentMarketingCrew:
     
     def _save_campaign_files(self, campaign):
         """Save final campaign in multiple formats"""
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        timestamp = self.run_id
         
         # Save complete campaign as JSON
         campaign_file = f"output/complete_campaign_{timestamp}.json"
-        with open(campaign_file, 'w', encoding='utf-8') as f:
-            json.dump(campaign, f, indent=2, ensure_ascii=False)
+        self._write_json(campaign_file, campaign)
         
         # Save campaign summary as text
         summary_file = f"output/campaign_summary_{timestamp}.txt"
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            f.write("CONTENT MARKETING CAMPAIGN SUMMARY\n")
-            f.write("=" * 50 + "\n\n")
-            
-            # Blog info
-            blog_data = campaign.get('blog_article', {})
-            f.write(f"📝 BLOG ARTICLE\n")
-            f.write(f"Headline: {blog_data.get('headline', 'N/A')}\n")
-            f.write(f"Word Count: {blog_data.get('word_count', 'N/A')}\n")
-            f.write(f"Reading Time: {blog_data.get('reading_time', 'N/A')}\n\n")
-            
-            # Social media info
-            social_data = campaign.get('social_media', {})
-            linkedin_count = len(social_data.get('linkedin_posts', {}).get('linkedin_posts', []))
-            twitter_count = len(social_data.get('twitter_posts', {}).get('twitter_posts', []))
-            
-            f.write(f"📱 SOCIAL MEDIA CONTENT\n")
-            f.write(f"LinkedIn Posts: {linkedin_count}\n")
-            f.write(f"Twitter Posts: {twitter_count}\n\n")
-            
-            # Schedule info
-            schedule_data = campaign.get('posting_schedule', {})
-            campaign_overview = schedule_data.get('campaign_overview', {})
-            
-            f.write(f"📅 POSTING SCHEDULE\n")
-            f.write(f"Campaign Start: {campaign_overview.get('start_date', 'N/A')}\n")
-            f.write(f"Campaign End: {campaign_overview.get('end_date', 'N/A')}\n")
-            f.write(f"Total Posts: {campaign_overview.get('total_posts', 'N/A')}\n\n")
-            
-            # Success metrics
-            metrics = schedule_data.get('success_metrics', [])
-            if metrics:
-                f.write(f"📊 SUCCESS METRICS\n")
-                for metric in metrics:
-                    f.write(f"• {metric}\n")
-        
-        print(f"   ✓ Final campaign saved as {campaign_file} and {summary_file}")
+        self._write_text(summary_file, self._campaign_summary_text(campaign))
+        
+        logger.info(f"   ✓ Final campaign saved as {campaign_file} and {summary_file}")
+    
+    def _campaign_summary_text(self, campaign):
+        """Render the plain-text campaign summary"""
+        parts = [
+            "CONTENT MARKETING CAMPAIGN SUMMARY\n",
+            "=" * 50 + "\n\n"
+        ]
+        
+        # Blog info
+        blog_data = campaign.get('blog_article', {})
+        parts.append(
+            f"📝 BLOG ARTICLE\n"
+            f"Headline: {blog_data.get('headline', 'N/A')}\n"
+            f"Word Count: {blog_data.get('word_count', 'N/A')}\n"
+            f"Reading Time: {blog_data.get('reading_time', 'N/A')}\n\n"
+        )
+        
+        # Social media info
+        summary = campaign.get('campaign_summary', {})
+        parts.append(
+            f"📱 SOCIAL MEDIA CONTENT\n"
+            f"LinkedIn Posts: {summary.get('total_linkedin_posts', 0)}\n"
+            f"Twitter Posts: {summary.get('total_twitter_posts', 0)}\n\n"
+        )
+        
+        # Schedule info
+        schedule_data = campaign.get('posting_schedule', {})
+        campaign_overview = schedule_data.get('campaign_overview', {})
+        
+        parts.append(
+            f"📅 POSTING SCHEDULE\n"
+            f"Campaign Start: {campaign_overview.get('start_date', 'N/A')}\n"
+            f"Campaign End: {campaign_overview.get('end_date', 'N/A')}\n"
+            f"Total Posts: {campaign_overview.get('total_posts', 'N/A')}\n\n"
+        )
+        
+        # Success metrics
+        metrics = schedule_data.get('success_metrics', [])
+        if metrics:
+            parts.append("📊 SUCCESS METRICS\n")
+            parts.extend(f"• {metric}\n" for metric in metrics)
+        
+        return "".join(parts)
     
     def run_custom_workflow(self, workflow_config):
         """
@@ -352,7 +560,8 @@ class ContentMarketingCrew:
             dict: Workflow results
         """
         try:
-            print("🔧 Running custom workflow...")
+            logger.info("🔧 Running custom workflow...")
+            self.run_id = datetime.now().strftime('%Y%m%d_%H%M%S')
             
             # Extract configuration
             steps = workflow_config.get('steps', ['research', 'blog', 'social', 'schedule'])
@@ -386,10 +595,11 @@ class ContentMarketingCrew:
                 timezone = params.get('timezone', 'UTC')
                 results['schedule'] = self._run_scheduling(content_data, target_audience, timezone)
             
-            print("✅ Custom workflow completed!")
+            self._flush_writes()
+            logger.info("✅ Custom workflow completed!")
             return results
             
         except Exception as e:
             error_msg = f"Custom workflow failed: {str(e)}"
-            print(f"❌ {error_msg}")
+            logger.error(f"❌ {error_msg}")
             return {"error": error_msg}
@@ -6,13 +6,25 @@ A CrewAI-powered workflow for automated content marketing
 
 import os
 import sys
+import csv
 import json
+import logging
 import argparse
-from datetime import datetime
+import itertools
 from dotenv import load_dotenv
 
 # Import our crew and configuration
-from crew.crew import ContentMarketingCrew
+from crew.crew import ContentMarketingCrew, BRAND_VOICES
+
+
+def configure_logging(quiet=False):
+    """Send pipeline progress to stdout; quiet mode only shows warnings and errors"""
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    
+    logger = logging.getLogger("pipeline")
+    logger.addHandler(handler)
+    logger.setLevel(logging.WARNING if quiet else logging.INFO)
 
 
 def load_environment():
@@ -32,6 +44,16 @@ def load_environment():
     return True
 
 
+def _iter_keywords(path):
+    """Yield the non-empty, non-comment lines of a keyword file, reading only as far as needed"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            # Skip empty lines and comments
+            if line and not line.startswith('#'):
+                yield line
+
+
 def load_seed_keywords(keyword_source=None):
     """
     Load seed keywords from various sources
@@ -46,17 +68,10 @@ def load_seed_keywords(keyword_source=None):
     # If no source provided, try to load from sample file
     if not keyword_source:
         try:
-            with open('sample_data/seed_keywords.txt', 'r', encoding='utf-8') as f:
-                keywords = []
-                for line in f:
-                    line = line.strip()
-                    # Skip empty lines and comments
-                    if line and not line.startswith('#'):
-                        keywords.append(line)
-                
-                # Take first 5 keywords for default run
-                return keywords[:5] if keywords else ["business automation", "digital marketing"]
-                
+            # Take first 5 keywords for default run
+            keywords = list(itertools.islice(_iter_keywords('sample_data/seed_keywords.txt'), 5))
+            return keywords if keywords else ["business automation", "digital marketing"]
+            
         except FileNotFoundError:
             print("⚠️ Warning: sample_data/seed_keywords.txt not found, using default keywords")
             return ["business automation", "digital marketing", "productivity tools"]
@@ -64,13 +79,8 @@ def load_seed_keywords(keyword_source=None):
     # If keyword_source is a file path
     if os.path.isfile(keyword_source):
         try:
-            with open(keyword_source, 'r', encoding='utf-8') as f:
-                keywords = []
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith('#'):
-                        keywords.append(line)
-                return keywords if keywords else ["business automation"]
+            keywords = list(_iter_keywords(keyword_source))
+            return keywords if keywords else ["business automation"]
         except Exception as e:
             print(f"❌ Error reading keyword file {keyword_source}: {e}")
             sys.exit(1)
@@ -80,6 +90,74 @@ def load_seed_keywords(keyword_source=None):
     return keywords if keywords else ["business automation"]
 
 
+# run_complete_pipeline arguments a batch file row may set; other columns are ignored
+BATCH_COLUMNS = ("seed_keywords", "industry_context", "target_audience", "word_count", "brand_voice", "timezone")
+
+
+def load_batch_rows(batch_file, defaults):
+    """
+    Load campaign inputs for batch mode from a CSV or JSON file
+    
+    Args:
+        batch_file (str): CSV file with a header row, or JSON file holding a list of objects;
+            columns are run_complete_pipeline arguments (see BATCH_COLUMNS)
+        defaults (dict): Values used for columns that are missing or empty in a row
+        
+    Returns:
+        list: run_complete_pipeline keyword arguments, one dict per campaign; invalid values are
+            kept as they are, so the pipeline reports them as that row's error
+    """
+    with open(batch_file, 'r', newline='', encoding='utf-8') as f:
+        if batch_file.lower().endswith('.json'):
+            rows = json.load(f)
+        else:
+            rows = list(csv.DictReader(f))
+    
+    unknown = sorted({key for row in rows for key in row if key not in BATCH_COLUMNS})
+    if unknown:
+        print(f"⚠️ Ignoring unknown batch columns: {', '.join(map(str, unknown))}")
+    
+    campaigns = []
+    for row in rows:
+        campaign = {**defaults, **{key: value for key, value in row.items()
+                                   if key in BATCH_COLUMNS and value not in (None, "")}}
+        try:
+            campaign['word_count'] = int(campaign['word_count'])
+        except (TypeError, ValueError):
+            pass
+        campaigns.append(campaign)
+    return campaigns
+
+
+def run_batch(crew, args):
+    """Run one campaign per batch file row and report each row's outcome"""
+    rows = load_batch_rows(args.batch_file, {
+        "seed_keywords": load_seed_keywords(args.keywords_file or args.keywords),
+        "industry_context": args.industry_context,
+        "target_audience": args.audience,
+        "word_count": args.word_count,
+        "brand_voice": args.voice,
+        "timezone": args.timezone
+    })
+    
+    print(f"📦 Running {len(rows)} campaigns from {args.batch_file} ({args.max_workers} at a time)")
+    results = crew.kickoff_for_each(rows, max_workers=args.max_workers)
+    
+    failed = 0
+    print(f"\n📦 BATCH RESULTS")
+    for index, result in enumerate(results):
+        if result.get('error'):
+            failed += 1
+            print(f"   ❌ Row {index + 1}: {result['error']}")
+        else:
+            run_id = result['campaign_metadata']['run_id']
+            print(f"   ✅ Row {index + 1}: output/complete_campaign_{run_id}.json")
+    
+    print(f"\n{len(results) - failed} of {len(results)} campaigns completed")
+    if failed:
+        sys.exit(1)
+
+
 def print_welcome():
     """Print welcome message and pipeline information"""
     print("=" * 60)
@@ -151,7 +229,8 @@ Examples:
   python main.py
   python main.py --keywords "AI automation, B2B SaaS, productivity"
   python main.py --keywords-file custom_keywords.txt --audience "tech startups"
-  python main.py --word-count 400 --voice "casual" --timezone "EST"
+  python main.py --word-count 400 --voice "casual" --timezone "America/New_York"
+  python main.py --batch-file campaigns.csv --max-workers 4
         """
     )
     
@@ -192,7 +271,7 @@ Examples:
         '--voice', '-v',
         type=str,
         default="professional",
-        choices=['professional', 'casual', 'authoritative', 'friendly', 'technical'],
+        choices=BRAND_VOICES,
         help='Brand voice style (default: professional)'
     )
     
@@ -200,7 +279,7 @@ Examples:
         '--timezone', '-tz',
         type=str,
         default="UTC",
-        help='Target timezone for scheduling (default: UTC)'
+        help='Target timezone for scheduling, as an IANA name such as "America/New_York" (default: UTC)'
     )
     
     parser.add_argument(
@@ -209,6 +288,19 @@ Examples:
         help='Path to custom workflow configuration JSON file'
     )
     
+    parser.add_argument(
+        '--batch-file', '-b',
+        type=str,
+        help='CSV or JSON file of campaign inputs, one campaign per row; missing columns use the other options'
+    )
+    
+    parser.add_argument(
+        '--max-workers',
+        type=int,
+        default=4,
+        help='Campaigns run concurrently in batch mode (default: 4)'
+    )
+    
     parser.add_argument(
         '--quiet', '-q',
         action='store_true',
@@ -216,6 +308,7 @@ Examples:
     )
     
     args = parser.parse_args()
+    configure_logging(args.quiet)
     
     # Print welcome message unless in quiet mode
     if not args.quiet:
@@ -225,6 +318,11 @@ Examples:
         # Load and validate environment
         load_environment()
         
+        # Batch mode runs every row of the batch file with one crew
+        if args.batch_file:
+            run_batch(ContentMarketingCrew(), args)
+            return
+        
         # Load seed keywords
         keyword_source = args.keywords_file or args.keywords
         seed_keywords = load_seed_keywords(keyword_source)
@@ -237,11 +335,6 @@ Examples:
             print(f"🌍 Timezone: {args.timezone}")
             print()
         
-        # Validate word count
-        if not (300 <= args.word_count <= 600):
-            print("❌ Error: Word count must be between 300 and 600")
-            sys.exit(1)
-        
         # Initialize the crew
         crew = ContentMarketingCrew()
         
@@ -263,14 +356,18 @@ Examples:
         
         else:
             # Run the complete pipeline with provided parameters
-            results = crew.run_complete_pipeline(
-                seed_keywords=seed_keywords,
-                industry_context=args.industry_context,
-                target_audience=args.audience,
-                word_count=args.word_count,
-                brand_voice=args.voice,
-                timezone=args.timezone
-            )
+            try:
+                results = crew.run_complete_pipeline(
+                    seed_keywords=seed_keywords,
+                    industry_context=args.industry_context,
+                    target_audience=args.audience,
+                    word_count=args.word_count,
+                    brand_voice=args.voice,
+                    timezone=args.timezone
+                )
+            except ValueError as e:
+                print(f"❌ Error: {e}")
+                sys.exit(1)
         
         # Check for errors
         if results.get('error'):
@@ -287,7 +384,7 @@ Examples:
         
         # Print quick access info
         if not args.quiet:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            timestamp = crew.run_id
             print(f"\n🔗 Quick access:")
             print(f"   Blog article: output/blog_article_{timestamp}.md")
             print(f"   Full campaign: output/complete_campaign_{timestamp}.json")
@@ -3,15 +3,341 @@ Task definitions for Content Marketing Pipeline
 Defines all tasks that agents will execute in the workflow
 """
 
-from crewai import Task
+import os
+import hashlib
+import functools
 from datetime import datetime
+from utils.llm_cache import LLMCache, request_key
+from utils.openai_client import LLM_CACHE_DIR
+from utils.jsonutil import loads
+from utils.output import OUTPUT_DIR, ensure_output_dir
+
+
+# Prepended to the tasks that build on earlier results, so their agents reuse earlier tool output
+_MEMORY_REUSE_INSTRUCTION = """Check previous ToolMessage responses in conversation history before making new tool calls. \
+Extract data from previous tool outputs instead of calling tools again with the same parameters.
+
+"""
+
+# Task descriptions, filled per task with str.format_map; the expected outputs are static.
+# The per-task inputs come last so each description starts with a static instruction prefix
+# that the provider's prompt cache can reuse across tasks and runs.
+_TOPIC_RESEARCH_DESCRIPTION_TEMPLATE = """Research and identify 3-5 trending topics in the industry based on the seed keywords below.
+
+Your research should:
+1. Analyze current market trends and conversations
+2. Identify topics with high engagement potential
+3. Consider SEO opportunities and search volume
+4. Evaluate competition levels for each topic
+5. Suggest content angles that would resonate with the target audience
+
+For each trending topic, provide:
+- Topic title and description
+- Why it's currently trending
+- Target audience appeal and engagement potential
+- Suggested content angles and approaches
+- SEO potential score (1-10)
+- Competition analysis
+- Urgency level (high/medium/low)
+
+Focus on topics that balance trending appeal with evergreen value for long-term content strategy.
+
+Seed keywords: {keywords_str}
+Industry context: {industry_context}
+"""
+
+_BLOG_WRITING_DESCRIPTION_TEMPLATE = """Write a compelling, well-researched blog article based on the provided topic research data.
+
+Your article should:
+1. Have an engaging headline that captures attention
+2. Include a compelling opening hook
+3. Be structured with clear subheadings and logical flow
+4. Provide actionable insights and practical value
+5. Include relevant examples or case studies
+6. End with a strong call-to-action
+7. Be optimized for SEO while maintaining readability
+8. Match the specified brand voice and tone
+
+Requirements:
+- Stay within the 300-600 word count range
+- Use markdown formatting for structure
+- Include meta description (150-160 characters)
+- Suggest relevant tags and categories
+- Provide key takeaways summary
+- Include estimated reading time
+
+Target word count: {word_count} words (must be between 300-600 words)
+Brand voice: {brand_voice}
+"""
+
+_SOCIAL_MEDIA_DESCRIPTION_TEMPLATE = """Create engaging social media posts for the target platforms based on the provided blog article.
+
+Content strategy:
+- Mix promotional content with value-driven insights
+- Adapt tone for each platform's audience
+- Create posts that can work independently or as a series
+- Include clear calls-to-action driving traffic to the blog
+- Optimize for each platform's algorithm and best practices
+
+{platform_sections}
+
+Target platforms: {platforms_str}
+"""
+
+_LINKEDIN_BLOCK = """For LinkedIn posts:
+1. Create 2-3 professional, value-driven posts
+2. Use thought leadership tone and industry insights
+3. Include relevant professional hashtags (5-10)
+4. Keep under 1300 characters for optimal engagement
+5. End with engagement-driving questions or CTAs
+6. Use line breaks and emojis strategically"""
+
+_TWITTER_BLOCK = """For Twitter/X posts:
+1. Create 3-5 engaging posts of various types
+2. Include single tweets, quote tweets, and questions
+3. Create one thread starter if appropriate
+4. Keep individual tweets under 280 characters
+5. Use 2-3 relevant hashtags maximum
+6. Include engaging hooks and conversation starters"""
+
+# Instructions for each supported platform; only the requested platforms are sent to the LLM
+_PLATFORM_BLOCKS = {
+    "linkedin": _LINKEDIN_BLOCK,
+    "twitter": _TWITTER_BLOCK
+}
+
+_SCHEDULING_DESCRIPTION_TEMPLATE = _MEMORY_REUSE_INSTRUCTION + """Create an optimal posting schedule for the complete content marketing campaign.
+
+Your scheduling strategy should:
+1. Determine optimal posting times for each platform
+2. Consider audience behavior patterns and platform algorithms
+3. Create a logical sequence that builds momentum
+4. Avoid audience fatigue with proper spacing
+5. Maximize reach and engagement potential
+6. Account for timezone and business hours
+7. Balance promotional and value-driven content
+
+Platform-specific considerations:
+- Blog: Best days for long-form content consumption
+- LinkedIn: Professional audience business hours and networking times
+- Twitter/X: Fast-paced environment with multiple daily opportunities
+
+Schedule requirements:
+1. Specify exact dates and times for each piece of content
+2. Provide rationale for each timing decision
+3. Include preparation deadlines and workflow timing
+4. Suggest monitoring and engagement windows
+5. Create CSV export format for calendar import
+6. Include backup timing options for flexibility
+
+Target audience: {audience}
+Timezone: {timezone}
+"""
+
+_CAMPAIGN_OPTIMIZATION_DESCRIPTION_TEMPLATE = _MEMORY_REUSE_INSTRUCTION + """Analyze and optimize the complete content marketing campaign for maximum impact.
+
+Your optimization should cover:
+1. Content quality and value proposition analysis
+2. Cross-platform consistency and brand voice
+3. SEO optimization opportunities
+4. Engagement potential assessment
+5. Campaign timing and sequencing refinements
+6. Performance prediction and success metrics
+7. Risk assessment and mitigation strategies
+
+Optimization areas:
+- Headlines and hooks for better click-through rates
+- Content structure and readability improvements
+- Hashtag strategy and keyword optimization
+- Call-to-action effectiveness
+- Platform-specific content adaptations
+- Posting frequency and timing adjustments
+
+Provide actionable recommendations for:
+1. Content improvements before publishing
+2. Alternative posting strategies
+3. A/B testing opportunities
+4. Performance monitoring checkpoints
+5. Campaign success measurement criteria
+"""
+
+
+@functools.lru_cache(maxsize=128)
+def _join_csv(items):
+    return ", ".join(items)
+
+
+def _csv(value):
+    """Render a list of keywords or platforms (or a single value) as a comma-separated string"""
+    if isinstance(value, (list, tuple)):
+        # Tuples are hashable, so repeated lists reuse the cached join
+        return _join_csv(tuple(value))
+    return str(value)
+
+
+# Expected output contract of each task, keyed by task name; kept in a sidecar file so it
+# can be revised without touching the prompt templates
+with open(os.path.join(os.path.dirname(__file__), "expected_outputs.json"), 'rb') as _f:
+    _EXPECTED_OUTPUTS = loads(_f.read())
+
+# Output file path of each task, filled with the run timestamp
+_OUT_TOPIC = os.path.join(OUTPUT_DIR, "topic_research_{ts}.json")
+_OUT_BLOG = os.path.join(OUTPUT_DIR, "blog_article_{ts}.json")
+_OUT_SOCIAL = os.path.join(OUTPUT_DIR, "social_posts_{ts}.json")
+_OUT_SCHEDULE = os.path.join(OUTPUT_DIR, "posting_schedule_{ts}.json")
+_OUT_OPTIMIZATION = os.path.join(OUTPUT_DIR, "campaign_optimization_{ts}.json")
+
+# Platforms targeted by the social media task when none are given
+_DEFAULT_PLATFORMS = ("linkedin", "twitter")
+
+# Position of each task in the fixed pipeline; a factory called again replaces its task
+_TASK_SLOTS = {name: slot for slot, name in enumerate((
+    "topic_research", "blog_writing", "social_media", "scheduling", "campaign_optimization"
+))}
+
+
+# Replayed task outputs are sampled LLM output built on trending research, so they expire after a week
+PROGRAM_CACHE_TTL = 7 * 24 * 60 * 60
+
+
+class PromptProgramCache:
+    """
+    Task outputs keyed by their prompt program: the static template plus the dynamic slot values
+    
+    A task whose template and slots match an earlier run replays that run's output instead of
+    calling its agent again.
+    """
+    
+    def __init__(self, path=None, ttl=PROGRAM_CACHE_TTL):
+        self._store = LLMCache(path or os.path.join(LLM_CACHE_DIR, "task_programs.sqlite"))
+        # Maximum age in seconds of a replayable output (None: never expires)
+        self.ttl = ttl
+    
+    def key(self, template, expected_output, slots):
+        """
+        Build the cache key for a task
+        
+        Args:
+            template (str): Description template
+            expected_output (str): Static expected output
+            slots (dict): Values substituted into the template
+            
+        Returns:
+            str: Cache key
+        """
+        return request_key({
+            "template": _template_id(template, expected_output),
+            "slots": {name: str(value) for name, value in slots.items()}
+        })
+    
+    def get(self, key):
+        """Return the cached raw task output for key, or None if missing or expired"""
+        return self._store.get(key, self.ttl)
+    
+    def set(self, key, raw):
+        """Store the raw task output for key"""
+        self._store.set(key, raw)
+
+
+@functools.cache
+def _template_id(template, expected_output):
+    return hashlib.blake2b(f"{template}\0{expected_output}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+@functools.cache
+def _crewai_classes():
+    """
+    Import CrewAI's task classes on first use
+    
+    Returns:
+        tuple: (Task, TaskOutput)
+    """
+    # Deferred: importing CrewAI pulls in its whole dependency graph
+    from crewai import Task
+    from crewai.tasks.task_output import TaskOutput
+    return Task, TaskOutput
+
+
+@functools.cache
+def _task_builder(name):
+    """
+    Task constructor for one pipeline slot, with the slot's static expected output already bound
+    
+    Args:
+        name (str): Task slot name
+        
+    Returns:
+        functools.partial: Callable taking the per-run fields (description, agent, output_file, ...)
+    """
+    return functools.partial(_crewai_classes()[0], expected_output=_EXPECTED_OUTPUTS[name])
 
 
 class ContentMarketingTasks:
     """Container for all content marketing pipeline tasks"""
     
-    def __init__(self):
-        self.tasks = []
+    __slots__ = ("tasks", "program_cache", "_program_keys", "_run_ts")
+    
+    def __init__(self, program_cache=None, run_ts=None):
+        self.tasks = [None] * len(_TASK_SLOTS)
+        # Optional PromptProgramCache; tasks repeating an earlier prompt program replay its output
+        self.program_cache = program_cache
+        # Cache key of the task in each slot (None if uncached); it covers the task's upstream programs too
+        self._program_keys = [None] * len(_TASK_SLOTS)
+        # Timestamp shared by the output files of every task in a run
+        self._run_ts = run_ts or datetime.now().strftime('%Y%m%d_%H%M%S')
+        # Replayed task outputs are written straight to their output files
+        ensure_output_dir()
+    
+    def _create_task(self, name, template, slots, agent, output_file, context=None):
+        """
+        Fill a description template and create the task for slot name, keyed in the program cache
+        when one is set
+        
+        Upstream results are not inlined into the description: the context tasks' outputs are
+        passed to the agent by CrewAI when the task runs.
+        
+        Raises:
+            TypeError: If context holds anything other than tasks (e.g. the result data the
+                factories took before they took upstream tasks)
+        """
+        description = template.format_map(slots)
+        fields = {}
+        if context is not None:
+            context = list(context) if isinstance(context, (list, tuple)) else [context]
+            task_class = _crewai_classes()[0]
+            for upstream in context:
+                if not isinstance(upstream, task_class):
+                    raise TypeError(f"Task context must be Task objects, got {type(upstream).__name__}; "
+                                    "pass the upstream task instead of its result data")
+            fields["context"] = context
+        
+        # Upstream outputs are part of a task's inputs, so its key chains its context tasks' keys
+        key = None
+        if self.program_cache is not None:
+            upstream = [self._program_key(task) for task in fields.get("context", [])]
+            if None not in upstream:
+                key = request_key([self.program_cache.key(template, _EXPECTED_OUTPUTS[name], slots), upstream])
+                fields["callback"] = functools.partial(self._store_output, key)
+        
+        task = _task_builder(name)(description=description, agent=agent, output_file=output_file, **fields)
+        # Overwriting the slot drops the replaced task's key along with the task
+        slot = _TASK_SLOTS[name]
+        self.tasks[slot] = task
+        self._program_keys[slot] = key
+        return task
+    
+    def _program_key(self, task):
+        """Program cache key of a task currently held by this container, or None"""
+        for slot, current in enumerate(self.tasks):
+            if current is task:
+                return self._program_keys[slot]
+        return None
+    
+    def _store_output(self, key, output):
+        """Task callback storing a completed task's output in the program cache"""
+        # Only non-empty outputs are kept; failed tasks raise before their callback runs
+        if output.raw and output.raw.strip():
+            self.program_cache.set(key, output.raw)
     
     def topic_research_task(self, agent, seed_keywords, industry_context=""):
         """
@@ -25,296 +351,196 @@ class ContentMarketingTasks:
         Returns:
             Task: CrewAI task for topic research
         """
-        keywords_str = ", ".join(seed_keywords) if isinstance(seed_keywords, list) else str(seed_keywords)
+        keywords_str = _csv(seed_keywords)
         
-        task = Task(
-            description=f"""
-            Research and identify 3-5 trending topics in the industry based on these seed keywords: {keywords_str}
-            
-            Industry context: {industry_context}
-            
-            Your research should:
-            1. Analyze current market trends and conversations
-            2. Identify topics with high engagement potential
-            3. Consider SEO opportunities and search volume
-            4. Evaluate competition levels for each topic
-            5. Suggest content angles that would resonate with the target audience
-            
-            For each trending topic, provide:
-            - Topic title and description
-            - Why it's currently trending
-            - Target audience appeal and engagement potential
-            - Suggested content angles and approaches
-            - SEO potential score (1-10)
-            - Competition analysis
-            - Urgency level (high/medium/low)
-            
-            Focus on topics that balance trending appeal with evergreen value for long-term content strategy.
-            """,
-            expected_output="""
-            A comprehensive research report containing:
-            1. List of 3-5 trending topics with detailed analysis
-            2. Market insights and industry observations  
-            3. Recommended focus topic with justification
-            4. Content strategy recommendations
-            5. SEO and competition analysis for each topic
-            
-            Format: JSON structure with trending_topics array, market_insights, and recommended_focus
-            """,
+        return self._create_task(
+            "topic_research",
+            _TOPIC_RESEARCH_DESCRIPTION_TEMPLATE,
+            {
+                "keywords_str": keywords_str,
+                "industry_context": industry_context
+            },
             agent=agent,
-            output_file=f"output/topic_research_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            output_file=_OUT_TOPIC.format(ts=self._run_ts)
         )
-        
-        self.tasks.append(task)
-        return task
     
-    def blog_writing_task(self, agent, topic_data, word_count=500, brand_voice="professional"):
+    def blog_writing_task(self, agent, topic_task, word_count=500, brand_voice="professional"):
         """
         Task for writing blog articles
         
         Args:
             agent: BlogWriterAgent instance
-            topic_data: Research data from topic research task
+            topic_task (Task): Topic research task whose output is passed as context
             word_count (int): Target word count (300-600)
             brand_voice (str): Brand voice style
             
         Returns:
             Task: CrewAI task for blog writing
         """
-        task = Task(
-            description=f"""
-            Write a compelling, well-researched blog article based on the provided topic research data.
-            
-            Topic research input: {topic_data}
-            Target word count: {word_count} words (must be between 300-600 words)
-            Brand voice: {brand_voice}
-            
-            Your article should:
-            1. Have an engaging headline that captures attention
-            2. Include a compelling opening hook
-            3. Be structured with clear subheadings and logical flow
-            4. Provide actionable insights and practical value
-            5. Include relevant examples or case studies
-            6. End with a strong call-to-action
-            7. Be optimized for SEO while maintaining readability
-            8. Match the specified brand voice and tone
-            
-            Requirements:
-            - Stay within the 300-600 word count range
-            - Use markdown formatting for structure
-            - Include meta description (150-160 characters)
-            - Suggest relevant tags and categories
-            - Provide key takeaways summary
-            - Include estimated reading time
-            """,
-            expected_output="""
-            A complete blog article package containing:
-            1. SEO-optimized headline
-            2. Meta description (150-160 characters)
-            3. Full article content in markdown format
-            4. Word count and reading time estimate
-            5. Key takeaways list (3-5 bullet points)
-            6. Suggested tags and categories
-            7. Call-to-action text
-            
-            Format: JSON structure with all components properly formatted
-            """,
+        return self._create_task(
+            "blog_writing",
+            _BLOG_WRITING_DESCRIPTION_TEMPLATE,
+            {
+                "word_count": word_count,
+                "brand_voice": brand_voice
+            },
             agent=agent,
-            output_file=f"output/blog_article_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            output_file=_OUT_BLOG.format(ts=self._run_ts),
+            context=topic_task
         )
-        
-        self.tasks.append(task)
-        return task
     
-    def social_media_task(self, agent, blog_data, platforms=["linkedin", "twitter"]):
+    def social_media_task(self, agent, blog_task, platforms=_DEFAULT_PLATFORMS):
         """
         Task for creating social media posts
         
         Args:
             agent: SocialPostAgent instance
-            blog_data: Blog article data from blog writing task
-            platforms (list): Target social media platforms
+            blog_task (Task): Blog writing task whose output is passed as context
+            platforms (list or tuple): Target social media platforms
             
         Returns:
             Task: CrewAI task for social media content creation
         """
-        platforms_str = ", ".join(platforms)
+        platforms_str = _csv(platforms)
+        platform_sections = "\n\n".join(
+            _PLATFORM_BLOCKS[p] for p in platforms if p in _PLATFORM_BLOCKS
+        )
         
-        task = Task(
-            description=f"""
-            Create engaging social media posts for {platforms_str} based on the provided blog article.
-            
-            Blog article data: {blog_data}
-            Target platforms: {platforms}
-            
-            For LinkedIn posts:
-            1. Create 2-3 professional, value-driven posts
-            2. Use thought leadership tone and industry insights
-            3. Include relevant professional hashtags (5-10)
-            4. Keep under 1300 characters for optimal engagement
-            5. End with engagement-driving questions or CTAs
-            6. Use line breaks and emojis strategically
-            
-            For Twitter/X posts:
-            1. Create 3-5 engaging posts of various types
-            2. Include single tweets, quote tweets, and questions
-            3. Create one thread starter if appropriate
-            4. Keep individual tweets under 280 characters
-            5. Use 2-3 relevant hashtags maximum
-            6. Include engaging hooks and conversation starters
-            
-            Content strategy:
-            - Mix promotional content with value-driven insights
-            - Adapt tone for each platform's audience
-            - Create posts that can work independently or as a series
-            - Include clear calls-to-action driving traffic to the blog
-            - Optimize for each platform's algorithm and best practices
-            """,
-            expected_output="""
-            Complete social media content package containing:
-            1. LinkedIn posts (2-3) with character counts, hashtags, and engagement tips
-            2. Twitter/X posts (3-5) including single tweets and thread options
-            3. Platform-specific optimization notes
-            4. Posting strategy recommendations
-            5. Hashtag research and suggestions
-            6. Expected engagement predictions
-            
-            Format: JSON structure with separate arrays for each platform
-            """,
+        return self._create_task(
+            "social_media",
+            _SOCIAL_MEDIA_DESCRIPTION_TEMPLATE,
+            {
+                "platform_sections": platform_sections,
+                "platforms_str": platforms_str
+            },
             agent=agent,
-            output_file=f"output/social_posts_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            output_file=_OUT_SOCIAL.format(ts=self._run_ts),
+            context=blog_task
         )
-        
-        self.tasks.append(task)
-        return task
     
-    def scheduling_task(self, agent, content_data, audience="B2B professionals", timezone="UTC"):
+    def scheduling_task(self, agent, content_tasks, audience="B2B professionals", timezone="UTC"):
         """
         Task for creating posting schedule
         
         Args:
             agent: SchedulerAgent instance
-            content_data: All content from previous tasks
+            content_tasks (list): Content tasks (blog, social media) whose outputs are passed as context
             audience (str): Target audience description
             timezone (str): Target timezone for scheduling
             
         Returns:
             Task: CrewAI task for content scheduling
         """
-        task = Task(
-            description=f"""
-            Create an optimal posting schedule for the complete content marketing campaign.
-            
-            Content data: {content_data}
-            Target audience: {audience}
-            Timezone: {timezone}
-            
-            Your scheduling strategy should:
-            1. Determine optimal posting times for each platform
-            2. Consider audience behavior patterns and platform algorithms
-            3. Create a logical sequence that builds momentum
-            4. Avoid audience fatigue with proper spacing
-            5. Maximize reach and engagement potential
-            6. Account for timezone and business hours
-            7. Balance promotional and value-driven content
-            
-            Platform-specific considerations:
-            - Blog: Best days for long-form content consumption
-            - LinkedIn: Professional audience business hours and networking times
-            - Twitter/X: Fast-paced environment with multiple daily opportunities
-            
-            Schedule requirements:
-            1. Specify exact dates and times for each piece of content
-            2. Provide rationale for each timing decision
-            3. Include preparation deadlines and workflow timing
-            4. Suggest monitoring and engagement windows
-            5. Create CSV export format for calendar import
-            6. Include backup timing options for flexibility
-            """,
-            expected_output="""
-            Comprehensive posting schedule containing:
-            1. Campaign overview with start/end dates and strategy
-            2. Blog post schedule with optimal timing and rationale
-            3. LinkedIn posting schedule with business hour optimization
-            4. Twitter/X posting schedule with engagement timing
-            5. CSV-formatted schedule for calendar import
-            6. Optimization tips and success metrics
-            7. Platform-specific best practice recommendations
-            
-            Format: JSON structure with detailed scheduling data and CSV export
-            """,
+        return self._create_task(
+            "scheduling",
+            _SCHEDULING_DESCRIPTION_TEMPLATE,
+            {
+                "audience": audience,
+                "timezone": timezone
+            },
             agent=agent,
-            output_file=f"output/posting_schedule_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            output_file=_OUT_SCHEDULE.format(ts=self._run_ts),
+            context=content_tasks
         )
-        
-        self.tasks.append(task)
-        return task
     
-    def campaign_optimization_task(self, agent, campaign_data):
+    def campaign_optimization_task(self, agent, campaign_tasks):
         """
         Task for optimizing the complete campaign
         
         Args:
             agent: Any agent that can perform optimization analysis
-            campaign_data: Complete campaign data from all previous tasks
+            campaign_tasks (list): Earlier pipeline tasks whose outputs are passed as context
             
         Returns:
             Task: CrewAI task for campaign optimization
         """
-        task = Task(
-            description=f"""
-            Analyze and optimize the complete content marketing campaign for maximum impact.
-            
-            Campaign data: {campaign_data}
-            
-            Your optimization should cover:
-            1. Content quality and value proposition analysis
-            2. Cross-platform consistency and brand voice
-            3. SEO optimization opportunities
-            4. Engagement potential assessment
-            5. Campaign timing and sequencing refinements
-            6. Performance prediction and success metrics
-            7. Risk assessment and mitigation strategies
-            
-            Optimization areas:
-            - Headlines and hooks for better click-through rates
-            - Content structure and readability improvements
-            - Hashtag strategy and keyword optimization
-            - Call-to-action effectiveness
-            - Platform-specific content adaptations
-            - Posting frequency and timing adjustments
-            
-            Provide actionable recommendations for:
-            1. Content improvements before publishing
-            2. Alternative posting strategies
-            3. A/B testing opportunities
-            4. Performance monitoring checkpoints
-            5. Campaign success measurement criteria
-            """,
-            expected_output="""
-            Campaign optimization report containing:
-            1. Content quality assessment and improvement suggestions
-            2. SEO and engagement optimization recommendations
-            3. Platform-specific enhancement strategies
-            4. Alternative timing and sequencing options
-            5. Performance prediction with success metrics
-            6. Risk analysis and mitigation strategies
-            7. A/B testing recommendations
-            8. Campaign monitoring and adjustment guidelines
-            
-            Format: JSON structure with optimization insights and actionable recommendations
-            """,
+        return self._create_task(
+            "campaign_optimization",
+            _CAMPAIGN_OPTIMIZATION_DESCRIPTION_TEMPLATE,
+            {},
             agent=agent,
-            output_file=f"output/campaign_optimization_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+            output_file=_OUT_OPTIMIZATION.format(ts=self._run_ts),
+            context=campaign_tasks
         )
+    
+    def build_pipeline(self, agents, seed_keywords, industry_context="", word_count=500,
+                       brand_voice="professional", platforms=_DEFAULT_PLATFORMS,
+                       audience="B2B professionals", timezone="UTC"):
+        """
+        Create all five pipeline tasks in one call, wiring each task's context to its upstream tasks
         
-        self.tasks.append(task)
-        return task
+        Args:
+            agents (list or tuple): Agents for the topic research, blog writing, social media,
+                scheduling and campaign optimization tasks, in that order
+            seed_keywords (list): List of seed keywords
+            industry_context (str): Additional industry context
+            word_count (int): Target word count (300-600)
+            brand_voice (str): Brand voice style
+            platforms (list or tuple): Target social media platforms
+            audience (str): Target audience description
+            timezone (str): Target timezone for scheduling
+            
+        Returns:
+            tuple: The five tasks, in pipeline order
+        """
+        topic_agent, blog_agent, social_agent, scheduler_agent, optimization_agent = agents
+        
+        topic = self.topic_research_task(topic_agent, seed_keywords, industry_context)
+        blog = self.blog_writing_task(blog_agent, topic, word_count, brand_voice)
+        social = self.social_media_task(social_agent, blog, platforms)
+        schedule = self.scheduling_task(scheduler_agent, (blog, social), audience, timezone)
+        optimization = self.campaign_optimization_task(optimization_agent, (topic, blog, social, schedule))
+        
+        return topic, blog, social, schedule, optimization
     
     def get_all_tasks(self):
-        """Return all created tasks"""
-        return self.tasks
+        """Return all created tasks, in pipeline order"""
+        return [task for task in self.tasks if task is not None]
+    
+    def pending_tasks(self):
+        """
+        Restore the outputs of tasks whose prompt program is cached and return the tasks left to run
+        
+        A task is replayed only when every task it takes context from was replayed too, so a cached
+        output never follows a freshly generated upstream one. Replayed tasks keep their output for
+        the context of later tasks; pass only the returned tasks to the Crew.
+        
+        Returns:
+            list: Tasks that still need to run, in pipeline order
+        """
+        tasks = self.get_all_tasks()
+        if self.program_cache is None:
+            return tasks
+        
+        TaskOutput = _crewai_classes()[1]
+        replayed = set()
+        pending = []
+        for task in tasks:
+            key = self._program_key(task)
+            raw = self.program_cache.get(key) if key else None
+            if raw is None or not all(id(upstream) in replayed for upstream in task.context or []):
+                pending.append(task)
+                continue
+            
+            task.output = TaskOutput(
+                name=task.name,
+                description=task.description,
+                expected_output=task.expected_output,
+                raw=raw,
+                agent=task.agent.role if task.agent else ""
+            )
+            if task.output_file:
+                with open(task.output_file, 'w', encoding='utf-8') as f:
+                    f.write(raw)
+            replayed.add(id(task))
+        return pending
     
     def clear_tasks(self):
         """Clear all tasks for a fresh start"""
-        self.tasks = []
+        self.tasks = [None] * len(_TASK_SLOTS)
+        self._program_keys = [None] * len(_TASK_SLOTS)
+    
+    def new_run(self, run_ts=None):
+        """Start a new pipeline run: clear the tasks and take a fresh output timestamp (or run_ts)"""
+        self.clear_tasks()
+        self._run_ts = run_ts or datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -0,0 +1,44 @@
+"""
+Shared LangChain chat models for Content Marketing Pipeline
+Memoizes ChatOpenAI instances so agents with the same settings share one client
+"""
+
+import os
+import threading
+from typing import TYPE_CHECKING
+from utils.openai_client import get_http_client
+
+if TYPE_CHECKING:
+    from langchain_openai import ChatOpenAI
+
+
+_LLM_CACHE: dict[tuple, "ChatOpenAI"] = {}
+_llm_lock = threading.Lock()
+
+
+def get_llm(model, temperature):
+    """
+    Return the shared ChatOpenAI instance for a model/temperature pair
+    
+    Args:
+        model (str): OpenAI model name
+        temperature (float): Sampling temperature
+        
+    Returns:
+        ChatOpenAI: Chat model backed by the shared HTTP/2 connection pool
+    """
+    key = (model, temperature)
+    with _llm_lock:
+        llm = _LLM_CACHE.get(key)
+        if llm is None:
+            # Deferred so modules that never build a chat model don't pay for importing LangChain
+            from langchain_openai import ChatOpenAI
+            
+            llm = _LLM_CACHE[key] = ChatOpenAI(
+                model=model,
+                api_key=os.getenv("OPENAI_API_KEY"),
+                temperature=temperature,
+                http_client=get_http_client()
+            )
+        return llm
+
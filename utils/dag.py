@@ -0,0 +1,44 @@
+"""
+DAG executor for Content Marketing Pipeline
+Runs async pipeline nodes as soon as the nodes they depend on have completed
+"""
+
+import asyncio
+
+
+async def run_dag(nodes, failed=None):
+    """
+    Run a dependency graph of async nodes, starting each node once its dependencies finish
+    
+    Args:
+        nodes (list): (node_id, fn, deps) tuples; fn is an async callable that receives the
+            results of its dependencies as positional arguments, in deps order
+        failed (callable): Optional predicate result -> bool; nodes depending on a failed
+            (or skipped) node are skipped
+            
+    Returns:
+        dict: Results keyed by node_id; skipped nodes are absent
+    """
+    results = {}
+    broken = set()
+    done = {node_id: asyncio.Event() for node_id, _, _ in nodes}
+    
+    async def run(node_id, fn, deps):
+        try:
+            for dep in deps:
+                await done[dep].wait()
+            if broken.intersection(deps):
+                broken.add(node_id)
+                return
+            
+            result = results[node_id] = await fn(*(results[dep] for dep in deps))
+            if failed and failed(result):
+                broken.add(node_id)
+        except BaseException:
+            broken.add(node_id)
+            raise
+        finally:
+            done[node_id].set()
+    
+    await asyncio.gather(*(run(*node) for node in nodes))
+    return results
@@ -0,0 +1,72 @@
+"""
+JSON helpers for Content Marketing Pipeline
+Fast orjson-backed encoding and decoding shared by the agents and utilities
+"""
+
+import re
+import orjson
+
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError (and ValueError)
+JSONDecodeError = orjson.JSONDecodeError
+
+# JSON document (object or array) wrapped in a markdown code fence, with or without a "json" tag
+_FENCE_RE = re.compile(r"```(?:json)?\s*(.*?)```", re.S)
+
+
+def loads(data):
+    """
+    Parse a JSON document
+    
+    Args:
+        data (str | bytes): JSON text
+        
+    Returns:
+        The decoded Python object
+        
+    Raises:
+        JSONDecodeError: If the data is not valid JSON
+    """
+    return orjson.loads(data)
+
+
+def dumps(obj):
+    """
+    Serialize an object to a compact JSON string
+    
+    Args:
+        obj: JSON-serializable object
+        
+    Returns:
+        str: The encoded JSON
+    """
+    return orjson.dumps(obj).decode("utf-8")
+
+
+def write_json(path, obj):
+    """
+    Write an object to a file as indented UTF-8 JSON
+    
+    Args:
+        path (str): Output file path
+        obj: JSON-serializable object
+    """
+    with open(path, 'wb') as f:
+        f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+
+
+def loads_response(content):
+    """
+    Parse the JSON in an LLM response, unwrapping a markdown code fence if present
+    
+    Args:
+        content (str): Response content
+        
+    Returns:
+        The decoded Python object
+        
+    Raises:
+        JSONDecodeError: If no valid JSON is found
+    """
+    match = _FENCE_RE.search(content)
+    return orjson.loads(match.group(1).strip() if match else content)
@@ -0,0 +1,72 @@
+"""
+LLM response cache for Content Marketing Pipeline
+Persists response content on disk, keyed by a hash of the full request
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from utils.jsonutil import dumps
+
+
+def request_key(request):
+    """
+    Hash a chat completion request into a cache key
+    
+    Args:
+        request (dict): Request body (model, temperature, messages, response_format, ...)
+        
+    Returns:
+        str: 32-character hex digest
+    """
+    return hashlib.blake2b(dumps(request).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed store of LLM response content"""
+    
+    def __init__(self, path):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+    
+    def _connection(self):
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, content TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+        return self._conn
+    
+    def get(self, key, ttl=None):
+        """Return the cached content for key, or None if missing or older than ttl seconds"""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT content, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or (ttl is not None and time.time() - row[1] > ttl):
+            return None
+        return row[0]
+    
+    def set(self, key, content):
+        """Store the content for key"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, content, created_at) VALUES (?, ?, ?)",
+                (key, content, time.time())
+            )
+            conn.commit()
+    
+    def clear(self):
+        """Remove every cached response"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM responses")
+            conn.commit()
@@ -0,0 +1,65 @@
+"""
+OpenAI Batch API helpers for Content Marketing Pipeline
+Submits bulk chat completion requests through the /v1/batches endpoint
+"""
+
+import time
+from utils.openai_client import get_client
+from utils.jsonutil import loads, dumps
+
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+def run_chat_batch(bodies, client=None, poll_interval=30, timeout=None):
+    """
+    Run chat completion requests through the OpenAI Batch API and wait for the results
+    
+    Args:
+        bodies (dict): Chat completion request bodies keyed by custom_id
+        client (OpenAI): OpenAI client to use (defaults to the shared client)
+        poll_interval (int): Seconds to wait between batch status checks
+        timeout (float): Maximum seconds to wait, or None to wait for the 24h completion window
+        
+    Returns:
+        dict: Response message content keyed by custom_id (None for requests that failed)
+    """
+    client = client or get_client()
+    
+    lines = [
+        dumps({"custom_id": custom_id, "method": "POST", "url": BATCH_ENDPOINT, "body": body})
+        for custom_id, body in bodies.items()
+    ]
+    input_file = client.files.create(
+        file=("batch_input.jsonl", "\n".join(lines).encode("utf-8")),
+        purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=input_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window="24h"
+    )
+    
+    deadline = time.monotonic() + timeout if timeout else None
+    while batch.status not in TERMINAL_STATUSES:
+        if deadline and time.monotonic() > deadline:
+            raise TimeoutError(f"Batch {batch.id} still {batch.status} after {timeout} seconds")
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch.id)
+    
+    if batch.status != "completed":
+        raise RuntimeError(f"Batch {batch.id} ended with status '{batch.status}'")
+    
+    results = dict.fromkeys(bodies)
+    if batch.output_file_id:
+        output = client.files.content(batch.output_file_id).text
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            record = loads(line)
+            response = record.get('response') or {}
+            if response.get('status_code') == 200:
+                results[record['custom_id']] = response['body']['choices'][0]['message']['content']
+    
+    return results
@@ -0,0 +1,615 @@
+"""
+Shared OpenAI client helpers for Content Marketing Pipeline
+Dispatches chat completions through raw OpenAI clients with bounded concurrency
+"""
+
+import os
+import re
+import time
+import asyncio
+import functools
+import collections
+import contextlib
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+import httpx
+from openai import OpenAI, AsyncOpenAI, RateLimitError, APIConnectionError, APITimeoutError, InternalServerError
+from pydantic import ValidationError
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential_jitter
+from utils.llm_cache import LLMCache, request_key
+
+
+# Upper bound on in-flight requests; size it to the account's RPM/TPM limits
+MAX_CONCURRENT_REQUESTS = int(os.getenv("OPENAI_MAX_CONCURRENT", "8"))
+REQUEST_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "60"))
+
+# Pooled keep-alive HTTP/2 connections: one sync client per process, and one async client on the
+# long-lived loop that run_sync dispatches to
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=200)
+
+# Deterministic (temperature 0) responses are cached on disk when enabled
+CACHE_ENABLED = os.getenv("CACHE_ENABLED", "false").lower() == "true"
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", ".llm_cache")
+
+# Failures worth retrying (429s, 5xx server errors and network trouble);
+# everything else surfaces to the caller immediately
+TRANSIENT_ERRORS = (RateLimitError, InternalServerError, APIConnectionError, APITimeoutError)
+
+_RESET_PART_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_RESET_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+_client = None
+_http_client = None
+_client_lock = threading.Lock()
+_loop = None
+
+# The async client is bound to the event loop that first uses it, so keep one per loop;
+# sync wrappers all share the background loop's client
+_async_clients = weakref.WeakKeyDictionary()
+
+# Response-cache I/O runs on its own threads so it never queues behind pipeline stage workers
+_cache_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="llm-cache")
+
+# Per-request-key locks that deduplicate identical in-flight cached requests, as
+# key -> [lock, callers holding or waiting on it]; an entry is dropped once unused
+_key_locks_lock = threading.Lock()
+_sync_key_locks = {}
+_async_key_locks = weakref.WeakKeyDictionary()
+
+
+class StructuredOutputError(ValueError):
+    """Raised when a structured-output response is refused or fails schema validation"""
+
+
+class StreamInterruptedError(RuntimeError):
+    """Raised when a streamed response fails after some of its deltas were already delivered"""
+
+
+class StreamedResponse:
+    """Accumulates streamed content deltas and joins them once, on first access"""
+    
+    def __init__(self, on_chunk=None):
+        self.chunks = []
+        self.refusal = None
+        self._on_chunk = on_chunk
+    
+    def feed(self, chunk):
+        """Record one streamed chat completion chunk"""
+        if not chunk.choices:
+            return
+        delta = chunk.choices[0].delta
+        if getattr(delta, 'refusal', None):
+            self.refusal = (self.refusal or "") + delta.refusal
+        if delta.content:
+            self.chunks.append(delta.content)
+            if self._on_chunk:
+                self._on_chunk(delta.content)
+    
+    def looks_complete(self):
+        """Cheap check that the JSON document has been closed, before attempting to parse it"""
+        for chunk in reversed(self.chunks):
+            tail = chunk.rstrip()
+            if tail:
+                return tail[-1] in "}]"
+        return False
+    
+    @functools.cached_property
+    def content(self):
+        """The full response content"""
+        return "".join(self.chunks)
+
+
+def _parse_reset(value):
+    """Convert an x-ratelimit-reset header value (e.g. "6m0s", "20ms") to seconds"""
+    return sum(float(amount) * _RESET_UNITS[unit] for amount, unit in _RESET_PART_RE.findall(value))
+
+
+class RequestLimiter:
+    """Process-wide cap on in-flight requests, shared by worker threads and every event loop"""
+    
+    def __init__(self, limit):
+        self._free = limit
+        self._lock = threading.Lock()
+        # (loop, future) for async waiters, (None, threading.Event) for threads
+        self._waiters = collections.deque()
+    
+    def release(self):
+        """Free a slot, handing it straight to the longest-waiting caller if there is one"""
+        with self._lock:
+            if not self._waiters:
+                self._free += 1
+                return
+            loop, waiter = self._waiters.popleft()
+        if loop is None:
+            waiter.set()
+            return
+        try:
+            loop.call_soon_threadsafe(self._wake, waiter)
+        except RuntimeError:  # The waiter's loop has closed
+            self.release()
+    
+    def _wake(self, future):
+        # A waiter cancelled before its turn came passes the slot on
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(None)
+    
+    def __enter__(self):
+        with self._lock:
+            if self._free:
+                self._free -= 1
+                return
+            event = threading.Event()
+            self._waiters.append((None, event))
+        event.wait()
+    
+    def __exit__(self, *exc_info):
+        self.release()
+    
+    async def __aenter__(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._free:
+                self._free -= 1
+                return
+            future = loop.create_future()
+            self._waiters.append((loop, future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                queued = (loop, future) in self._waiters
+                if queued:
+                    self._waiters.remove((loop, future))
+            # Cancelled after the slot was already handed over: give it back
+            if not queued and future.done() and not future.cancelled():
+                self.release()
+            raise
+    
+    async def __aexit__(self, *exc_info):
+        self.release()
+
+
+class RateLimiter:
+    """Pauses new requests once the x-ratelimit headers report an exhausted budget"""
+    
+    def __init__(self):
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+    
+    def delay(self):
+        """Seconds to wait before the next request may be sent"""
+        return max(0.0, self._resume_at - time.monotonic())
+    
+    def update(self, headers):
+        """Record the remaining request/token budget reported by a response"""
+        for kind in ("requests", "tokens"):
+            remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+            reset = headers.get(f"x-ratelimit-reset-{kind}")
+            if remaining is None or not reset:
+                continue
+            # The response has already succeeded; a malformed header is skipped rather than failing it
+            try:
+                if int(remaining) > 0:
+                    continue
+                delay = _parse_reset(reset)
+            except ValueError:
+                continue
+            with self._lock:
+                self._resume_at = max(self._resume_at, time.monotonic() + delay)
+
+
+rate_limiter = RateLimiter()
+request_limiter = RequestLimiter(MAX_CONCURRENT_REQUESTS)
+llm_cache = LLMCache(os.path.join(LLM_CACHE_DIR, "responses.sqlite"))
+
+
+def get_http_client():
+    """Return the process-wide pooled HTTP/2 client used for synchronous OpenAI requests"""
+    global _http_client
+    with _client_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(http2=True, limits=HTTP_LIMITS, timeout=REQUEST_TIMEOUT)
+        return _http_client
+
+
+def get_client():
+    """Return the process-wide OpenAI client"""
+    global _client
+    http_client = get_http_client()
+    with _client_lock:
+        if _client is None:
+            _client = OpenAI(
+                api_key=os.getenv("OPENAI_API_KEY"),
+                max_retries=0,  # Retries are handled by _retry_transient
+                http_client=http_client
+            )
+        return _client
+
+
+def get_async_client():
+    """Return the AsyncOpenAI client for the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = _async_clients[loop] = AsyncOpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            max_retries=0,  # Retries are handled by _retry_transient
+            http_client=httpx.AsyncClient(http2=True, limits=HTTP_LIMITS, timeout=REQUEST_TIMEOUT)
+        )
+    return client
+
+
+def _background_loop():
+    """Return the long-lived event loop that run_sync runs coroutines on, starting it on first use"""
+    global _loop
+    with _client_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="openai-client-loop", daemon=True).start()
+        return _loop
+
+
+def run_sync(coro):
+    """
+    Run a coroutine to completion from synchronous code
+    
+    Every call runs on one long-lived background loop, so the async client and its pooled
+    connections are reused across calls. This also works from inside a running loop (Jupyter,
+    async callers), where asyncio.run would raise.
+    
+    Args:
+        coro: Coroutine to run
+        
+    Returns:
+        The coroutine's result
+        
+    Raises:
+        RuntimeError: If called from a coroutine already running on the background loop
+    """
+    loop = _background_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        coro.close()
+        raise RuntimeError("run_sync would block the client event loop; await the coroutine instead")
+    
+    future = asyncio.run_coroutine_threadsafe(coro, loop)
+    try:
+        return future.result()
+    except BaseException:
+        future.cancel()
+        raise
+
+
+def build_messages(prompt, system=None):
+    """
+    Build a chat message list, with the static system prompt first so the prefix can be cached
+    
+    The agents keep their static instructions in the system prompt and only per-call specifics in
+    the user prompt, so the prompt prefix is identical across calls and cacheable by the provider.
+    """
+    messages = [{"role": "system", "content": system}] if system else []
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+def _chat_request(prompt, system, model, temperature, response_format=None):
+    request = {
+        "model": model,
+        "temperature": temperature,
+        "messages": build_messages(prompt, system)
+    }
+    if response_format:
+        request["response_format"] = response_format
+    return request
+
+
+def _check_restartable(streamed, error):
+    """Refuse to retry a stream whose deltas have already been passed to on_chunk"""
+    # A retried stream is a new generation; appending it to the delivered deltas would splice two together
+    if streamed.chunks:
+        raise StreamInterruptedError(f"Stream failed after partial output: {error}") from error
+
+
+# Exponential backoff (1s doubling, capped at 30s) plus jitter; the request slot is released while waiting
+_retry_transient = retry(
+    retry=retry_if_exception_type(TRANSIENT_ERRORS),
+    stop=stop_after_attempt(5),
+    wait=wait_exponential_jitter(initial=1, max=30),
+    reraise=True
+)
+
+
+@_retry_transient
+def _create(request):
+    delay = rate_limiter.delay()
+    if delay:
+        time.sleep(delay)
+    
+    with request_limiter:
+        raw = get_client().chat.completions.with_raw_response.create(**request)
+    
+    rate_limiter.update(raw.headers)
+    return raw.parse().choices[0].message
+
+
+@_retry_transient
+async def _acreate(request):
+    delay = rate_limiter.delay()
+    if delay:
+        await asyncio.sleep(delay)
+    
+    async with request_limiter:
+        raw = await get_async_client().chat.completions.with_raw_response.create(**request)
+    
+    rate_limiter.update(raw.headers)
+    return raw.parse().choices[0].message
+
+
+@_retry_transient
+def _create_streamed(request, on_chunk):
+    delay = rate_limiter.delay()
+    if delay:
+        time.sleep(delay)
+    
+    streamed = StreamedResponse(on_chunk)
+    with request_limiter:
+        raw = get_client().chat.completions.with_raw_response.create(**request, stream=True)
+        try:
+            with raw.parse() as stream:
+                for chunk in stream:
+                    streamed.feed(chunk)
+        except TRANSIENT_ERRORS as e:
+            _check_restartable(streamed, e)
+            raise
+    
+    rate_limiter.update(raw.headers)
+    return streamed
+
+
+@_retry_transient
+async def _acreate_streamed(request, on_chunk):
+    delay = rate_limiter.delay()
+    if delay:
+        await asyncio.sleep(delay)
+    
+    streamed = StreamedResponse(on_chunk)
+    async with request_limiter:
+        raw = await get_async_client().chat.completions.with_raw_response.create(**request, stream=True)
+        try:
+            async with raw.parse() as stream:
+                async for chunk in stream:
+                    streamed.feed(chunk)
+        except TRANSIENT_ERRORS as e:
+            _check_restartable(streamed, e)
+            raise
+    
+    rate_limiter.update(raw.headers)
+    return streamed
+
+
+@functools.lru_cache(maxsize=None)
+def response_format_for(schema):
+    """Build the strict json_schema response_format for a pydantic model"""
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": schema.__name__,
+            "schema": schema.model_json_schema(),
+            "strict": True
+        }
+    }
+
+
+def parse_structured(content, schema):
+    """
+    Validate a structured-output response against its schema
+    
+    Args:
+        content (str): Response message content
+        schema (type): Pydantic model the response must match
+        
+    Returns:
+        dict: The validated response data
+        
+    Raises:
+        StructuredOutputError: If the content does not match the schema
+    """
+    try:
+        return schema.model_validate_json(content or "").model_dump()
+    except ValidationError as e:
+        raise StructuredOutputError(f"Response did not match {schema.__name__}: {e}") from e
+
+
+def _message_content(message):
+    if getattr(message, 'refusal', None):
+        raise StructuredOutputError(f"Model refused the request: {message.refusal}")
+    if isinstance(message, StreamedResponse) and not message.looks_complete():
+        raise StructuredOutputError("Streamed response ended before the JSON was complete")
+    return message.content
+
+
+def use_cache(cache, temperature):
+    """
+    Decide whether a request should go through the response cache
+    
+    Args:
+        cache (bool): Explicit per-call setting, or None to follow CACHE_ENABLED
+        temperature (float): Sampling temperature of the request
+        
+    Returns:
+        bool: True if the response should be read from and written to the cache
+    """
+    # Sampled (temperature > 0) outputs are only cached when explicitly requested
+    if cache is None:
+        return CACHE_ENABLED and temperature == 0
+    return cache
+
+
+@contextlib.contextmanager
+def _sync_key_lock(key):
+    with _key_locks_lock:
+        entry = _sync_key_locks.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            yield
+    finally:
+        with _key_locks_lock:
+            entry[1] -= 1
+            if not entry[1]:
+                del _sync_key_locks[key]
+
+
+@contextlib.asynccontextmanager
+async def _async_key_lock(key):
+    loop = asyncio.get_running_loop()
+    locks = _async_key_locks.get(loop)
+    if locks is None:
+        locks = _async_key_locks[loop] = {}
+    # Only this loop touches its entries, so no thread lock is needed
+    entry = locks.setdefault(key, [asyncio.Lock(), 0])
+    entry[1] += 1
+    try:
+        async with entry[0]:
+            yield
+    finally:
+        entry[1] -= 1
+        if not entry[1]:
+            del locks[key]
+
+
+def _complete(request, parse, cache=False, on_chunk=None, ttl=None):
+    """Send a request (or serve it from the response cache) and parse the response content"""
+    if not cache:
+        message = _create_streamed(request, on_chunk) if on_chunk else _create(request)
+        return parse(_message_content(message))
+    
+    key = request_key(request)
+    # Identical concurrent requests wait for the first one instead of all hitting the API
+    with _sync_key_lock(key):
+        content = llm_cache.get(key, ttl)
+        if content is not None:
+            if on_chunk:
+                on_chunk(content)
+            return parse(content)
+        
+        message = _create_streamed(request, on_chunk) if on_chunk else _create(request)
+        content = _message_content(message)
+        result = parse(content)
+        llm_cache.set(key, content)
+        return result
+
+
+async def _acomplete(request, parse, cache=False, on_chunk=None, ttl=None):
+    """Async variant of _complete"""
+    if not cache:
+        message = await (_acreate_streamed(request, on_chunk) if on_chunk else _acreate(request))
+        return parse(_message_content(message))
+    
+    key = request_key(request)
+    async with _async_key_lock(key):
+        # SQLite I/O is blocking; keep it off the event loop
+        loop = asyncio.get_running_loop()
+        content = await loop.run_in_executor(_cache_executor, llm_cache.get, key, ttl)
+        if content is not None:
+            if on_chunk:
+                on_chunk(content)
+            return parse(content)
+        
+        message = await (_acreate_streamed(request, on_chunk) if on_chunk else _acreate(request))
+        content = _message_content(message)
+        result = parse(content)
+        await loop.run_in_executor(_cache_executor, llm_cache.set, key, content)
+        return result
+
+
+def _text(content):
+    return content
+
+
+def complete_text(prompt, model="gpt-4o", temperature=0.7, system=None, cache=None):
+    """
+    Run a plain-text chat completion
+    
+    Args:
+        prompt (str): User prompt
+        model (str): OpenAI model name
+        temperature (float): Sampling temperature
+        system (str): Optional static system prompt
+        cache (bool): Serve/store the response in the on-disk cache (default: only when CACHE_ENABLED and temperature is 0)
+        
+    Returns:
+        str: The response message content
+    """
+    request = _chat_request(prompt, system, model, temperature)
+    return _complete(request, _text, use_cache(cache, temperature))
+
+
+async def acomplete_text(prompt, model="gpt-4o", temperature=0.7, system=None, cache=None):
+    """Async variant of complete_text"""
+    request = _chat_request(prompt, system, model, temperature)
+    return await _acomplete(request, _text, use_cache(cache, temperature))
+
+
+def complete_json(prompt, model="gpt-4o", temperature=0.7, system=None, cache=None):
+    """
+    Run a JSON-mode chat completion
+    
+    Args:
+        prompt (str): User prompt (must ask for JSON output)
+        model (str): OpenAI model name
+        temperature (float): Sampling temperature
+        system (str): Optional static system prompt
+        cache (bool): Serve/store the response in the on-disk cache (default: only when CACHE_ENABLED and temperature is 0)
+        
+    Returns:
+        str: The response message content
+    """
+    request = _chat_request(prompt, system, model, temperature, {"type": "json_object"})
+    return _complete(request, _text, use_cache(cache, temperature))
+
+
+async def acomplete_json(prompt, model="gpt-4o", temperature=0.7, system=None, cache=None):
+    """Async variant of complete_json"""
+    request = _chat_request(prompt, system, model, temperature, {"type": "json_object"})
+    return await _acomplete(request, _text, use_cache(cache, temperature))
+
+
+def complete_structured(prompt, schema, model="gpt-4o", temperature=0.7, system=None, on_chunk=None, cache=None,
+                        cache_ttl=None):
+    """
+    Run a chat completion constrained to a pydantic schema (strict structured outputs)
+    
+    Args:
+        prompt (str): User prompt
+        schema (type): Pydantic model the response must match
+        model (str): OpenAI model name
+        temperature (float): Sampling temperature
+        system (str): Optional static system prompt
+        on_chunk (callable): Stream the response, passing each content delta to this callback
+        cache (bool): Serve/store the response in the on-disk cache (default: only when CACHE_ENABLED and temperature is 0)
+        cache_ttl (float): Maximum age in seconds of a reusable cached response (None: never expires)
+        
+    Returns:
+        dict: The validated response data
+        
+    Raises:
+        StructuredOutputError: If the model refuses or the response fails validation
+    """
+    request = _chat_request(prompt, system, model, temperature, response_format_for(schema))
+    parse = functools.partial(parse_structured, schema=schema)
+    return _complete(request, parse, use_cache(cache, temperature), on_chunk, cache_ttl)
+
+
+async def acomplete_structured(prompt, schema, model="gpt-4o", temperature=0.7, system=None, on_chunk=None,
+                               cache=None, cache_ttl=None):
+    """Async variant of complete_structured"""
+    request = _chat_request(prompt, system, model, temperature, response_format_for(schema))
+    parse = functools.partial(parse_structured, schema=schema)
+    return await _acomplete(request, parse, use_cache(cache, temperature), on_chunk, cache_ttl)
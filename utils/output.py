@@ -0,0 +1,19 @@
+"""
+Output directory helpers for Content Marketing Pipeline
+Shared by the crew and the task definitions, which both write under output/
+"""
+
+import os
+
+
+OUTPUT_DIR = "output"
+
+_output_dir_ready = False
+
+
+def ensure_output_dir():
+    """Create the output directory once per process"""
+    global _output_dir_ready
+    if not _output_dir_ready:
+        os.makedirs(OUTPUT_DIR, exist_ok=True)
+        _output_dir_ready = True